@@ -1,3 +1,13 @@
+import asyncio
+
+try:
+    import uvloop
+
+    # Must run before the clients below grab the event loop at import time
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
 from VIVAANXMUSIC.core.bot import JARVIS
 from VIVAANXMUSIC.core.dir import dirr
 from VIVAANXMUSIC.core.git import git
@@ -27,44 +37,19 @@ YouTube = YouTubeAPI()
 
 
 # ────────────────────────────────────────────────────────────
-# Anti-Edit & Anti-Abuse System Initialization
+# Anti-Edit & Anti-Abuse Database (initialized from __main__)
 # ────────────────────────────────────────────────────────────
 
-import motor.motor_asyncio
-import config
+import functools
 
-# MongoDB client and database
-MONGO_CLIENT = motor.motor_asyncio.AsyncIOMotorClient(config.MONGO_DB_URI)
-MONGO_DB = MONGO_CLIENT["VivaanXMusic"]  # ✅ Database name specified
 
-
-async def initialize_security_systems():
+@functools.lru_cache(maxsize=1)
+def get_mongo_db():
     """
-    Initialize anti-edit and anti-abuse security systems
-    Must be called during bot startup
+    Return the security database on the shared MongoDB client.
+    One connection pool serves the whole bot instead of one per module.
     """
-    try:
-        from VIVAANXMUSIC.mongo.edit_tracker_db import init_edit_tracker_db
-        from VIVAANXMUSIC.mongo.abuse_words_db import init_abuse_words_db
-        from VIVAANXMUSIC.utils.abuse_detector import init_abuse_detector
-        from VIVAANXMUSIC.utils.warning_manager import init_warning_manager
-        
-        # Initialize databases
-        await init_edit_tracker_db(MONGO_DB)
-        LOGGER(__name__).info("✅ Edit Tracker DB initialized")
-        
-        await init_abuse_words_db(MONGO_DB)
-        LOGGER(__name__).info("✅ Abuse Words DB initialized")
-        
-        # Initialize detectors and managers
-        init_abuse_detector()
-        LOGGER(__name__).info("✅ Abuse Detector initialized")
-        
-        init_warning_manager()
-        LOGGER(__name__).info("✅ Warning Manager initialized")
-        
-        LOGGER(__name__).info("🔒 Security systems initialized successfully")
-        
-    except Exception as e:
-        LOGGER(__name__).error(f"❌ Failed to initialize security systems: {e}")
-        raise
+    from VIVAANXMUSIC.core.mongo import _mongo_async_
+    
+    return _mongo_async_["VivaanXMusic"]  # ✅ Database name specified
+
@@ -7,68 +7,113 @@ Version: 4.0
 """
 
 import asyncio
+import compileall
+import hashlib
 import importlib
+import importlib.resources
+import importlib.util
 import json
+import sys
+import time
+from datetime import datetime
+from functools import partial
 from pathlib import Path
 
+from pymongo.errors import BulkWriteError
 from pyrogram import idle
 from pytgcalls.exceptions import NoActiveGroupCall
 
 import config
-from VIVAANXMUSIC import LOGGER, app, userbot
+from VIVAANXMUSIC import LOGGER, YouTube, app, userbot
 from VIVAANXMUSIC.core.call import JARVIS
 from VIVAANXMUSIC.misc import sudo
 from VIVAANXMUSIC.plugins import ALL_MODULES
-from VIVAANXMUSIC.utils.database import get_banned_users, get_gbanned
-from VIVAANXMUSIC.utils.cookie_handler import fetch_and_store_cookies
+from VIVAANXMUSIC.utils.cookie_handler import start_cookie_fetch
+from VIVAANXMUSIC.utils.database import (
+    get_banned_users,
+    get_gbanned,
+    get_vc_check,
+    set_vc_check,
+)
 from config import BANNED_USERS
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Records the digest of the abuse_words.json that was last seeded
+ABUSE_SEED_MARKER = "abuse_seed_v1"
+PLUGINS_DIR = importlib.resources.files("VIVAANXMUSIC.plugins")
+VC_CHECK_TTL = 3600  # Seconds a successful voice chat test stays valid
+
+# One-shot guards for the initialization coroutines below
+_edit_tracker_started = False
+_edit_tracker_inited = asyncio.Event()
+_security_started = False
+_security_inited = asyncio.Event()
+
 
 async def load_default_abuse_words():
     """
     Load default abuse words from JSON on first startup.
     Only loads words that don't already exist in database.
+    Skipped entirely while the ABUSE_SEED_MARKER document carries the
+    digest of the current JSON file, so editing the file re-seeds.
     """
     try:
-        from VIVAANXMUSIC.mongo.abuse_words_db import abuse_words_db
+        from VIVAANXMUSIC import get_mongo_db
         
         json_path = Path("VIVAANXMUSIC/assets/abuse_words.json")
         
-        if not json_path.exists():
+        # Read JSON file (raw bytes, no text-mode decoding pass)
+        try:
+            raw = json_path.read_bytes()
+        except FileNotFoundError:
             LOGGER(__name__).warning("⚠️ Default abuse_words.json not found - skipping word loading")
             return
         
-        # Read JSON file
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        digest = hashlib.sha1(raw).hexdigest()
+        mongo_db = get_mongo_db()
+        abuse_words = mongo_db["abuse_words"]
         
-        loaded_count = 0
-        skipped_count = 0
+        # Already seeded from this exact word list (e.g. by another container)
+        marker = await mongo_db["meta"].find_one({"_id": ABUSE_SEED_MARKER})
+        if marker and marker.get("digest") == digest:
+            LOGGER(__name__).info("📋 Abuse Words: already seeded")
+            return
         
-        # Load each word
-        for entry in data.get("default_words", []):
-            word = entry.get("word")
-            severity = entry.get("severity", "high")
-            
-            if not word:
-                continue
-            
-            # Check if word already exists
-            exists = await abuse_words_db.word_exists(word)
-            
-            if not exists:
-                # Add word to database
-                success = await abuse_words_db.add_abuse_word(
-                    word=word,
-                    severity=severity,
-                    patterns=[],
-                    added_by=0  # System added
-                )
-                
-                if success:
-                    loaded_count += 1
-            else:
-                skipped_count += 1
+        data = orjson.loads(raw) if orjson else json.loads(raw)
+        
+        entries = [e for e in data.get("default_words", []) if e.get("word")]
+        
+        # The unique index rejects already-present words server-side,
+        # so no existence pre-check is needed before inserting
+        await abuse_words.create_index([("word", 1)], unique=True, background=True)
+        
+        now = datetime.utcnow()
+        docs = [
+            {
+                "word": e["word"].lower().strip(),
+                "severity": e.get("severity", "high"),
+                "patterns": [],
+                "added_by": 0,  # System added
+                "added_at": now,
+                "updated_at": now
+            }
+            for e in entries
+        ]
+        
+        loaded_count = 0
+        if docs:
+            try:
+                result = await abuse_words.insert_many(docs, ordered=False)
+                loaded_count = len(result.inserted_ids)
+            except BulkWriteError as bwe:
+                if any(err.get("code") != 11000 for err in bwe.details.get("writeErrors", [])):
+                    raise
+                loaded_count = bwe.details.get("nInserted", 0)
+        skipped_count = len(docs) - loaded_count
         
         total_words = len(data.get("default_words", []))
         LOGGER(__name__).info(
@@ -76,15 +121,44 @@ async def load_default_abuse_words():
             f"{skipped_count} existing (Total: {total_words})"
         )
         
+        await mongo_db["meta"].update_one(
+            {"_id": ABUSE_SEED_MARKER},
+            {"$set": {"done": True, "count": total_words, "digest": digest}},
+            upsert=True
+        )
+        
     except Exception as e:
         LOGGER(__name__).error(f"❌ Failed to load abuse words: {e}")
 
 
+async def prepare_abuse_automaton():
+    """
+    Build the Aho-Corasick matcher from the seeded word list so the
+    first checked message doesn't pay for it.
+    """
+    try:
+        from VIVAANXMUSIC.mongo.abuse_words_db import get_abuse_words_db
+        
+        abuse_words_db = get_abuse_words_db()
+        if abuse_words_db:
+            await abuse_words_db.get_matcher()
+        
+    except Exception as e:
+        LOGGER(__name__).error(f"❌ Failed to prepare abuse automaton: {e}")
+
+
 async def initialize_edit_tracker_database():
     """
     Initialize edit tracker database with proper indexes.
     This ensures optimal query performance for anti-edit feature.
+    Runs once; concurrent or repeated calls wait for the first one.
     """
+    global _edit_tracker_started
+    if _edit_tracker_started:
+        await _edit_tracker_inited.wait()
+        return
+    _edit_tracker_started = True
+    
     try:
         from VIVAANXMUSIC.mongo.edit_tracker_db import initialize_database
         
@@ -96,25 +170,108 @@ async def initialize_edit_tracker_database():
         LOGGER(__name__).warning("⚠️ Edit tracker database module not found - anti-edit may not work")
     except Exception as e:
         LOGGER(__name__).error(f"❌ Edit tracker database initialization failed: {e}")
+    finally:
+        _edit_tracker_inited.set()
 
 
 async def initialize_security_systems():
     """
     Initialize all security systems including anti-edit and anti-abuse.
     Sets up database indexes and loads default configurations.
+    Runs once; concurrent or repeated calls wait for the first one.
     """
+    global _security_started
+    if _security_started:
+        await _security_inited.wait()
+        return
+    _security_started = True
+    
     try:
         # Initialize edit tracker database
         await initialize_edit_tracker_database()
         
+        # Group security (bio check) indexes
+        from VIVAANXMUSIC.mongo.group_security_db import gsdb
+        await gsdb.create_indexes()
+        
+        # Abuse words DB: indexes, cached word matcher, history flusher
+        from VIVAANXMUSIC import get_mongo_db
+        from VIVAANXMUSIC.mongo.abuse_words_db import init_abuse_words_db
+        await init_abuse_words_db(get_mongo_db())
+        
         # Load default abuse words
         await load_default_abuse_words()
+        await prepare_abuse_automaton()
         
         LOGGER(__name__).info("✅ All security systems initialized successfully")
         
     except Exception as e:
         LOGGER(__name__).error(f"❌ Security systems initialization error: {e}")
         # Non-critical, continue bot startup
+    finally:
+        _security_inited.set()
+
+
+def plugin_path(module: str) -> str:
+    """Resolve an ALL_MODULES entry (e.g. ".admins.skip") to its source file."""
+    return str(PLUGINS_DIR.joinpath(module.lstrip(".").replace(".", "/") + ".py"))
+
+
+def load_plugin(module: str):
+    """
+    Execute a plugin straight from its resolved file location,
+    skipping the sys.path finder walk done by importlib.import_module.
+    """
+    name = "VIVAANXMUSIC.plugins" + module
+    if name in sys.modules:
+        return sys.modules[name]
+    
+    parent_name, _, child = name.rpartition(".")
+    parent = importlib.import_module(parent_name)
+    
+    spec = importlib.util.spec_from_file_location(name, plugin_path(module))
+    plugin = importlib.util.module_from_spec(spec)
+    sys.modules[name] = plugin
+    try:
+        spec.loader.exec_module(plugin)
+    except BaseException:
+        sys.modules.pop(name, None)
+        raise
+    setattr(parent, child, plugin)
+    return plugin
+
+
+async def precompile_plugins():
+    """
+    Byte-compile all plugin sources in parallel worker threads.
+    Pyrogram registers handlers on the event loop while a plugin is
+    imported, so the imports themselves stay sequential; this only
+    warms the __pycache__ so each import skips compilation.
+    """
+    loop = asyncio.get_running_loop()
+    tasks = [
+        loop.run_in_executor(
+            None,
+            partial(compileall.compile_file, plugin_path(module), quiet=2),
+        )
+        for module in ALL_MODULES
+    ]
+    for module, result in zip(ALL_MODULES, await asyncio.gather(*tasks, return_exceptions=True)):
+        # compile_file reports syntax errors by returning False, not raising
+        if isinstance(result, Exception):
+            LOGGER("VIVAANXMUSIC.plugins").warning(f"⚠️ Could not precompile {module}: {result}")
+        elif not result:
+            LOGGER("VIVAANXMUSIC.plugins").warning(f"⚠️ Could not precompile {module}: compilation failed")
+
+
+def _log_cookie_result(task: asyncio.Task):
+    """Report the outcome of the background cookie fetch."""
+    if task.cancelled():
+        return
+    if task.exception():
+        LOGGER("VIVAANXMUSIC").warning(f"⚠️ Cookie error: {task.exception()}")
+    else:
+        LOGGER("VIVAANXMUSIC").info("✅ YouTube cookies loaded successfully")
 
 
 async def init():
@@ -144,102 +301,84 @@ async def init():
     LOGGER("VIVAANXMUSIC").info("🚀 Starting VivaanXMusic Bot...")
     
     # ==================== COOKIE HANDLER ====================
-    try:
-        LOGGER("VIVAANXMUSIC").info("🍪 Fetching YouTube cookies...")
-        await fetch_and_store_cookies()
-        LOGGER("VIVAANXMUSIC").info("✅ YouTube cookies loaded successfully")
-    except Exception as e:
-        LOGGER("VIVAANXMUSIC").warning(f"⚠️ Cookie error: {e}")
+    # Cookies are only needed once a song is downloaded, so the fetch runs
+    # in the background and yt-dlp downloads await it lazily.
+    start_cookie_fetch().add_done_callback(_log_cookie_result)
     
-    # ==================== SECURITY SYSTEMS ====================
-    LOGGER("VIVAANXMUSIC").info("🔒 Initializing security systems...")
-    try:
-        await initialize_security_systems()
-    except Exception as e:
-        LOGGER("VIVAANXMUSIC").error(f"❌ Security initialization failed: {e}")
-        # Continue anyway - security is non-critical for music playback
+    # ==================== BACKGROUND STARTUP I/O ====================
+    # Security systems and banned users have no dependencies on each
+    # other or on the bot client, so their network waits overlap.
+    security_task = asyncio.create_task(initialize_security_systems())
+    gbanned_task = asyncio.create_task(get_gbanned())
+    banned_task = asyncio.create_task(get_banned_users())
     
     # ==================== SUDO USERS ====================
     await sudo()
     
-    # ==================== BANNED USERS ====================
-    try:
-        LOGGER("VIVAANXMUSIC").info("📋 Loading banned users...")
-        users = await get_gbanned()
-        for user_id in users:
-            BANNED_USERS.add(user_id)
-        users = await get_banned_users()
-        for user_id in users:
-            BANNED_USERS.add(user_id)
-        LOGGER("VIVAANXMUSIC").info(f"✅ Loaded {len(BANNED_USERS)} banned users")
-    except Exception as e:
-        LOGGER("VIVAANXMUSIC").warning(f"⚠️ Error loading banned users: {e}")
-    
     # ==================== START BOT CLIENT ====================
-    LOGGER("VIVAANXMUSIC").info("🤖 Starting bot client...")
     await app.start()
-    LOGGER("VIVAANXMUSIC").info("✅ Bot client started")
+    
+    gbanned, banned, security = await asyncio.gather(
+        gbanned_task, banned_task, security_task,
+        return_exceptions=True
+    )
+    
+    # ==================== SECURITY SYSTEMS ====================
+    if isinstance(security, Exception):
+        # Continue anyway - security is non-critical for music playback
+        LOGGER("VIVAANXMUSIC").error(f"❌ Security initialization failed: {security}")
+    
+    # ==================== BANNED USERS ====================
+    for users in (gbanned, banned):
+        if isinstance(users, Exception):
+            LOGGER("VIVAANXMUSIC").warning(f"⚠️ Error loading banned users: {users}")
+            continue
+        BANNED_USERS.update(users)
+    
+    LOGGER("VIVAANXMUSIC").info(
+        f"✅ Bot client started | security: {'failed' if isinstance(security, Exception) else 'ok'}"
+        f" | banned users: {len(BANNED_USERS)}"
+    )
     
     # ==================== LOAD PLUGINS ====================
-    LOGGER("VIVAANXMUSIC.plugins").info("📦 Loading plugins...")
+    await precompile_plugins()
+    failed = []
     for all_module in ALL_MODULES:
         try:
-            importlib.import_module("VIVAANXMUSIC.plugins" + all_module)
+            load_plugin(all_module)
         except Exception as e:
-            LOGGER("VIVAANXMUSIC.plugins").error(f"❌ Failed to load {all_module}: {e}")
+            failed.append(f"{all_module} ({e})")
     
-    LOGGER("VIVAANXMUSIC.plugins").info("✅ All modules loaded successfully")
-    
-    # ==================== LOAD SECURITY PLUGINS ====================
-    # Explicitly import security plugins to ensure handlers are registered
-    try:
-        LOGGER("VIVAANXMUSIC.plugins").info("🔒 Loading security plugins...")
-        
-        # Import anti-edit plugin
-        try:
-            import VIVAANXMUSIC.plugins.admins.anti_edit
-            LOGGER("VIVAANXMUSIC.plugins").info("  ✓ Anti-edit plugin loaded")
-        except ImportError:
-            LOGGER("VIVAANXMUSIC.plugins").warning("  ⚠️ Anti-edit plugin not found")
-        except Exception as e:
-            LOGGER("VIVAANXMUSIC.plugins").error(f"  ✗ Anti-edit error: {e}")
-        
-        # Import anti-abuse plugin
-        try:
-            import VIVAANXMUSIC.plugins.admins.anti_abuse
-            LOGGER("VIVAANXMUSIC.plugins").info("  ✓ Anti-abuse plugin loaded")
-        except ImportError:
-            LOGGER("VIVAANXMUSIC.plugins").warning("  ⚠️ Anti-abuse plugin not found")
-        except Exception as e:
-            LOGGER("VIVAANXMUSIC.plugins").error(f"  ✗ Anti-abuse error: {e}")
-        
-        LOGGER("VIVAANXMUSIC.plugins").info("✅ Security plugins loaded")
-        
-    except Exception as e:
-        LOGGER("VIVAANXMUSIC.plugins").error(f"❌ Security plugins loading failed: {e}")
+    # Security plugins (anti-edit / anti-abuse) are regular admins/ plugins
+    # and are registered by the loop above
+    LOGGER("VIVAANXMUSIC.plugins").info(
+        f"📦 Loaded {len(ALL_MODULES) - len(failed)}/{len(ALL_MODULES)} plugins"
+    )
+    if failed:
+        LOGGER("VIVAANXMUSIC.plugins").error(f"❌ Failed to load: {', '.join(failed)}")
     
-    # ==================== START USERBOT ====================
-    LOGGER("VIVAANXMUSIC").info("👤 Starting userbot client...")
+    # ==================== START USERBOT & PYTGCALLS ====================
     await userbot.start()
-    LOGGER("VIVAANXMUSIC").info("✅ Userbot client started")
-    
-    # ==================== START PYTGCALLS ====================
-    LOGGER("VIVAANXMUSIC").info("📞 Starting PyTgCalls...")
     await JARVIS.start()
+    LOGGER("VIVAANXMUSIC").info("✅ Userbot client and PyTgCalls started")
     
-    # Test voice chat connection
-    try:
-        await JARVIS.stream_call(
-            "http://docs.evostream.com/sample_content/assets/sintel1m720p.mp4"
-        )
-    except NoActiveGroupCall:
-        LOGGER("VIVAANXMUSIC").error(
-            "❌ Please turn on the voice chat in your log group/channel.\n"
-            "VivaanXMusic Bot stopped."
-        )
-        exit()
-    except Exception as e:
-        LOGGER("VIVAANXMUSIC").warning(f"⚠️ Voice chat test warning: {e}")
+    # Test voice chat connection (skipped if it passed within VC_CHECK_TTL)
+    if time.time() - await get_vc_check() < VC_CHECK_TTL:
+        LOGGER("VIVAANXMUSIC").info("✅ Voice chat verified recently - skipping test stream")
+    else:
+        try:
+            await JARVIS.stream_call(
+                "http://docs.evostream.com/sample_content/assets/sintel1m720p.mp4"
+            )
+            await set_vc_check()
+        except NoActiveGroupCall:
+            LOGGER("VIVAANXMUSIC").error(
+                "❌ Please turn on the voice chat in your log group/channel.\n"
+                "VivaanXMusic Bot stopped."
+            )
+            exit()
+        except Exception as e:
+            LOGGER("VIVAANXMUSIC").warning(f"⚠️ Voice chat test warning: {e}")
     
     # ==================== FINALIZE STARTUP ====================
     await JARVIS.decorators()
@@ -255,6 +394,13 @@ async def init():
     
     # ==================== SHUTDOWN ====================
     LOGGER("VIVAANXMUSIC").info("🛑 Shutting down VivaanXMusic Bot...")
+    from VIVAANXMUSIC.mongo.abuse_words_db import get_abuse_words_db
+    from VIVAANXMUSIC.mongo.edit_tracker_db import get_edit_tracker_db
+    abuse_words_db = get_abuse_words_db()
+    if abuse_words_db:
+        await abuse_words_db.flush_history()
+    await get_edit_tracker_db().close()
+    await YouTube.close()
     await app.stop()
     await userbot.stop()
     LOGGER("VIVAANXMUSIC").info("👋 VivaanXMusic Bot stopped. Goodbye!")
@@ -263,6 +409,8 @@ async def init():
 if __name__ == "__main__":
     """Entry point for the bot."""
     try:
+        # Reuse the (uvloop) loop the pyrogram clients were bound to on import;
+        # asyncio.run() would start init() on a fresh, different loop.
         asyncio.get_event_loop().run_until_complete(init())
     except KeyboardInterrupt:
         LOGGER("VIVAANXMUSIC").info("🛑 Bot stopped by user (Ctrl+C)")
@@ -5,7 +5,15 @@ from ..logging import LOGGER
 LOGGER(__name__).info("Connecting to your Mongo Database...")
 
 try:
-    _mongo_async_ = AsyncIOMotorClient(MONGO_DB_URI, serverSelectionTimeoutMS=5000)
+    _mongo_async_ = AsyncIOMotorClient(
+        MONGO_DB_URI,
+        maxPoolSize=20,
+        minPoolSize=2,
+        maxIdleTimeMS=30000,
+        compressors="zstd,zlib",
+        serverSelectionTimeoutMS=5000,
+        retryWrites=True,
+    )
     mongodb = _mongo_async_.Vivaan
     LOGGER(__name__).info("Connected to your Mongo Database.")
 except Exception as e:
@@ -8,17 +8,62 @@ Functions:
 - Track user warnings and offenses
 - Handle abuse detection configuration per group
 - Pattern generation and management
+
+All stored timestamps are naive UTC (datetime.utcnow()).
 """
 
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple
+import asyncio
 import logging
+import time
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
-from pymongo import ASCENDING, DESCENDING
+from pymongo import ASCENDING, DESCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from pymongo.read_preferences import ReadPreference
+from pymongo.write_concern import WriteConcern
 from bson import ObjectId
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 logger = logging.getLogger(__name__)
 
+# Abuse history is written in batches by a background flusher
+HISTORY_BATCH_SIZE = 500
+HISTORY_FLUSH_INTERVAL = 0.5  # seconds
+
+# Per-chat config cache: entries live this long, least recently used
+# chats are evicted beyond the size cap
+CONFIG_CACHE_TTL = 60.0  # seconds
+CONFIG_CACHE_MAX = 4096
+
+# Configuration used for chats that never saved one; timestamps are only
+# written once set_config persists a row
+DEFAULT_CONFIG: Dict[str, Any] = {
+    "enabled": True,
+    "strict_mode": False,
+    "warning_limit": 3,
+    "action": "delete_only",
+    "mute_duration": 1440,
+    "delete_warning": True,
+    "warning_delete_time": 10,
+    "exclude_admins": True,
+    "notify_admins": False,
+    "log_channel": None,
+}
+
+# Warnings of users without a new offense for this long are dropped by Mongo
+WARNING_TTL = 30 * 24 * 3600  # seconds
+
+# Index options compared when checking an existing index against its spec
+INDEX_OPTIONS = ("unique", "expireAfterSeconds", "partialFilterExpression")
+
 
 class AbuseWordsDB:
     """MongoDB database handler for abuse word detection and warnings"""
@@ -35,41 +80,146 @@ class AbuseWordsDB:
         self.abuse_words_collection: AsyncIOMotorCollection = mongo_db["abuse_words"]
         self.user_warnings_collection: AsyncIOMotorCollection = mongo_db["abuse_warnings"]
         self.abuse_history_collection: AsyncIOMotorCollection = mongo_db["abuse_history"]
+        
+        # Read-only handles for audit/stats queries that tolerate replica lag;
+        # writes and the TTL index stay on the primary handles above
+        self.abuse_history_ro: AsyncIOMotorCollection = mongo_db.get_collection(
+            "abuse_history",
+            read_preference=ReadPreference.SECONDARY_PREFERRED
+        )
+        self.user_warnings_ro: AsyncIOMotorCollection = mongo_db.get_collection(
+            "abuse_warnings",
+            read_preference=ReadPreference.SECONDARY_PREFERRED
+        )
+        
+        # Write handles for the per-message path: history is best-effort audit
+        # data (unacknowledged), warnings only wait for the primary's memory
+        self.abuse_history_fast: AsyncIOMotorCollection = mongo_db.get_collection(
+            "abuse_history",
+            write_concern=WriteConcern(w=0)
+        )
+        self.warnings_fast: AsyncIOMotorCollection = mongo_db.get_collection(
+            "abuse_warnings",
+            write_concern=WriteConcern(w=1, j=False)
+        )
+        
+        # Same words collection, but documents stay undecoded BSON until read
+        self._raw_words_collection: AsyncIOMotorCollection = mongo_db.get_collection(
+            "abuse_words",
+            codec_options=CodecOptions(document_class=RawBSONDocument)
+        )
+        
+        # Per-chat config cache (LRU): chat_id -> (fetched_at, config)
+        self._config_cache: OrderedDict[int, Tuple[float, Dict[str, Any]]] = OrderedDict()
+        
+        # Word list and Aho-Corasick matcher, rebuilt after add/remove
+        self._word_list: Optional[List[str]] = None
+        self._word_set: Optional[set] = None
+        self._automaton = None
+        
+        # Pending abuse_history entries; None is the flusher's stop signal
+        self._history_queue: asyncio.Queue = asyncio.Queue()
+        self._history_task: Optional[asyncio.Task] = None
     
     async def create_indexes(self):
         """Create required MongoDB indexes for performance"""
+        # (name, keys, options) per collection; names match Mongo's defaults
+        # so indexes built by older versions are recognised
+        index_specs = [
+            (self.abuse_config_collection, [
+                ("chat_id_1", [("chat_id", ASCENDING)], {"unique": True}),
+            ]),
+            (self.abuse_words_collection, [
+                ("word_1", [("word", ASCENDING)], {"unique": True}),
+                ("severity_1", [("severity", ASCENDING)], {}),
+                ("patterns_1", [("patterns", ASCENDING)], {}),
+            ]),
+            # Only users with active warnings are indexed; untouched for
+            # WARNING_TTL -> expired
+            (self.user_warnings_collection, [
+                ("chat_id_1_user_id_1", [("chat_id", ASCENDING), ("user_id", ASCENDING)],
+                 {"unique": True, "partialFilterExpression": {"warnings": {"$gt": 0}}}),
+                ("chat_id_1", [("chat_id", ASCENDING)], {}),
+                ("user_id_1", [("user_id", ASCENDING)], {}),
+                ("last_offense_1", [("last_offense", ASCENDING)],
+                 {"expireAfterSeconds": WARNING_TTL}),
+            ]),
+            # Equality on chat_id, then sorted by time; auto-delete after 7 days
+            (self.abuse_history_collection, [
+                ("chat_id_1_timestamp_-1", [("chat_id", ASCENDING), ("timestamp", DESCENDING)], {}),
+                ("chat_id_1_user_id_1_timestamp_-1",
+                 [("chat_id", ASCENDING), ("user_id", ASCENDING), ("timestamp", DESCENDING)], {}),
+                ("timestamp_1", [("timestamp", ASCENDING)], {"expireAfterSeconds": 604800}),
+            ]),
+        ]
+        
         try:
-            # Config indexes
-            await self.abuse_config_collection.create_index("chat_id", unique=True)
-            
-            # Abuse words indexes
-            await self.abuse_words_collection.create_index("word", unique=True)
-            await self.abuse_words_collection.create_index("severity")
-            await self.abuse_words_collection.create_index("patterns")
-            
-            # User warnings indexes
-            await self.user_warnings_collection.create_index([("chat_id", ASCENDING), ("user_id", ASCENDING)])
-            await self.user_warnings_collection.create_index("chat_id")
-            await self.user_warnings_collection.create_index("user_id")
-            
-            # Abuse history indexes
-            await self.abuse_history_collection.create_index("chat_id")
-            await self.abuse_history_collection.create_index("user_id")
-            await self.abuse_history_collection.create_index("timestamp")
-            
-            # Try to create TTL index, ignore if it already exists with different options
-            try:
-                await self.abuse_history_collection.create_index(
-                    "timestamp",
-                    expireAfterSeconds=604800  # Auto-delete after 7 days
-                )
-            except Exception as idx_err:
-                logger.warning(f"[AbuseWordsDB] TTL index already exists or error: {idx_err}")
-            
-            logger.info("[AbuseWordsDB] Indexes created successfully")
+            created = await asyncio.gather(*(
+                self._sync_indexes(collection, specs)
+                for collection, specs in index_specs
+            ))
+            logger.info(f"[AbuseWordsDB] Indexes ready ({sum(created)} created)")
         except Exception as e:
             logger.error(f"[AbuseWordsDB] Error creating indexes: {e}")
     
+    @staticmethod
+    def _index_key(keys) -> List[Tuple[str, int]]:
+        """Normalise an index key spec (server may report 1.0 for 1)"""
+        return [(field, int(direction)) for field, direction in keys]
+    
+    @staticmethod
+    async def _sync_indexes(collection: AsyncIOMotorCollection, specs: List[Tuple]) -> int:
+        """
+        Create the indexes from specs the collection does not have yet, and
+        rebuild existing ones whose keys or options differ from the spec
+        
+        Args:
+            collection: Collection to index
+            specs: (name, keys, options) tuples
+            
+        Returns:
+            int: Number of indexes created
+        """
+        existing = await collection.index_information()
+        stale, missing = set(), []
+        
+        for name, keys, options in specs:
+            key = AbuseWordsDB._index_key(keys)
+            current = existing.get(name)
+            if current is not None:
+                if AbuseWordsDB._index_key(current["key"]) == key and all(
+                    current.get(option) == options.get(option) for option in INDEX_OPTIONS
+                ):
+                    continue
+                # e.g. a plain timestamp_1 where the spec wants a TTL index
+                stale.add(name)
+            else:
+                # Same keys under another name would block the create
+                stale.update(
+                    other for other, info in existing.items()
+                    if other != "_id_" and AbuseWordsDB._index_key(info["key"]) == key
+                )
+            missing.append((name, keys, options))
+        
+        for name in stale:
+            try:
+                await collection.drop_index(name)
+                logger.info(f"[AbuseWordsDB] Dropped outdated index {name}")
+            except Exception as e:
+                logger.warning(f"[AbuseWordsDB] Could not drop index {name}: {e}")
+        
+        results = await asyncio.gather(*(
+            collection.create_index(keys, name=name, background=True, **options)
+            for name, keys, options in missing
+        ), return_exceptions=True)
+        
+        # e.g. duplicates left by older versions block a unique index
+        for (name, _, _), result in zip(missing, results):
+            if isinstance(result, Exception):
+                logger.warning(f"[AbuseWordsDB] Could not create index {name}: {result}")
+        
+        return sum(not isinstance(result, Exception) for result in results)
+    
     # ────────────────────────────────────────────────────────────
     # Configuration Management
     # ────────────────────────────────────────────────────────────
@@ -84,28 +234,24 @@ class AbuseWordsDB:
         Returns:
             dict: Configuration dictionary with defaults
         """
+        cached = self._config_cache.get(chat_id)
+        if cached and time.monotonic() - cached[0] < CONFIG_CACHE_TTL:
+            self._config_cache.move_to_end(chat_id)
+            return dict(cached[1])
+        
         try:
-            config = await self.abuse_config_collection.find_one({"chat_id": chat_id})
-            
-            if config:
-                config.pop("_id", None)
-                return config
-            
-            return {
-                "chat_id": chat_id,
-                "enabled": True,
-                "strict_mode": False,
-                "warning_limit": 3,
-                "action": "delete_only",
-                "mute_duration": 1440,
-                "delete_warning": True,
-                "warning_delete_time": 10,
-                "exclude_admins": True,
-                "notify_admins": False,
-                "log_channel": None,
-                "created_at": datetime.now(),
-                "updated_at": datetime.now()
-            }
+            stored = await self.abuse_config_collection.find_one(
+                {"chat_id": chat_id},
+                projection={"_id": 0}
+            )
+            # Rows saved by older versions may lack newer keys
+            config = {"chat_id": chat_id, **DEFAULT_CONFIG, **(stored or {})}
+            
+            self._config_cache[chat_id] = (time.monotonic(), config)
+            self._config_cache.move_to_end(chat_id)
+            if len(self._config_cache) > CONFIG_CACHE_MAX:
+                self._config_cache.popitem(last=False)
+            return dict(config)
         except Exception as e:
             logger.error(f"[AbuseWordsDB] Error getting config for {chat_id}: {e}")
             return {
@@ -127,20 +273,22 @@ class AbuseWordsDB:
             bool: True if successful
         """
         try:
-            config["chat_id"] = chat_id
-            config["updated_at"] = datetime.now()
-            
-            await self.abuse_config_collection.update_one(
-                {"chat_id": chat_id},
-                {"$set": config},
-                upsert=True
-            )
+            await self._patch_config(chat_id, {**config, "chat_id": chat_id})
             logger.info(f"[AbuseWordsDB] Config updated for chat {chat_id}")
             return True
         except Exception as e:
             logger.error(f"[AbuseWordsDB] Error setting config for {chat_id}: {e}")
             return False
     
+    async def _patch_config(self, chat_id: int, patch: Dict[str, Any]):
+        """Upsert the given config fields and drop the cached copy"""
+        await self.abuse_config_collection.update_one(
+            {"chat_id": chat_id},
+            {"$set": {**patch, "updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+        self._config_cache.pop(chat_id, None)
+    
     async def set_action(self, chat_id: int, action: str) -> bool:
         """
         Set action type for abuse detection
@@ -159,16 +307,7 @@ class AbuseWordsDB:
                 logger.warning(f"[AbuseWordsDB] Invalid action: {action}")
                 return False
             
-            await self.abuse_config_collection.update_one(
-                {"chat_id": chat_id},
-                {
-                    "$set": {
-                        "action": action,
-                        "updated_at": datetime.now()
-                    }
-                },
-                upsert=True
-            )
+            await self._patch_config(chat_id, {"action": action})
             logger.info(f"[AbuseWordsDB] Action set to {action} for {chat_id}")
             return True
         except Exception as e:
@@ -191,16 +330,7 @@ class AbuseWordsDB:
                 logger.warning(f"[AbuseWordsDB] Invalid limit: {limit}")
                 return False
             
-            await self.abuse_config_collection.update_one(
-                {"chat_id": chat_id},
-                {
-                    "$set": {
-                        "warning_limit": limit,
-                        "updated_at": datetime.now()
-                    }
-                },
-                upsert=True
-            )
+            await self._patch_config(chat_id, {"warning_limit": limit})
             logger.info(f"[AbuseWordsDB] Warning limit set to {limit} for {chat_id}")
             return True
         except Exception as e:
@@ -219,16 +349,7 @@ class AbuseWordsDB:
             bool: True if successful
         """
         try:
-            await self.abuse_config_collection.update_one(
-                {"chat_id": chat_id},
-                {
-                    "$set": {
-                        "enabled": enabled,
-                        "updated_at": datetime.now()
-                    }
-                },
-                upsert=True
-            )
+            await self._patch_config(chat_id, {"enabled": enabled})
             logger.info(f"[AbuseWordsDB] Abuse detection {'enabled' if enabled else 'disabled'} for {chat_id}")
             return True
         except Exception as e:
@@ -239,6 +360,11 @@ class AbuseWordsDB:
     # Abuse Words Management
     # ────────────────────────────────────────────────────────────
     
+    @staticmethod
+    def _norm(word: str) -> str:
+        """Canonical form abuse words are stored and matched in"""
+        return word.lower().strip()
+    
     async def add_abuse_word(
         self,
         word: str,
@@ -259,29 +385,29 @@ class AbuseWordsDB:
             bool: True if successful
         """
         try:
-            word_lower = word.lower().strip()
+            word_lower = self._norm(word)
             
             if not word_lower:
                 logger.warning("[AbuseWordsDB] Empty word provided")
                 return False
             
-            existing = await self.abuse_words_collection.find_one({"word": word_lower})
-            if existing:
-                logger.warning(f"[AbuseWordsDB] Word already exists: {word_lower}")
-                return False
-            
+            now = datetime.utcnow()
             abuse_word = {
                 "word": word_lower,
                 "severity": severity,
                 "patterns": patterns or [],
                 "added_by": added_by,
-                "added_at": datetime.now(),
-                "updated_at": datetime.now()
+                "added_at": now,
+                "updated_at": now
             }
             
             await self.abuse_words_collection.insert_one(abuse_word)
+            self._invalidate_word_cache()
             logger.info(f"[AbuseWordsDB] Abuse word added: {word_lower}")
             return True
+        except DuplicateKeyError:
+            logger.warning(f"[AbuseWordsDB] Word already exists: {word_lower}")
+            return False
         except Exception as e:
             logger.error(f"[AbuseWordsDB] Error adding abuse word: {e}")
             return False
@@ -298,10 +424,11 @@ class AbuseWordsDB:
         """
         try:
             result = await self.abuse_words_collection.delete_one(
-                {"word": word.lower().strip()}
+                {"word": self._norm(word)}
             )
             
             if result.deleted_count > 0:
+                self._invalidate_word_cache()
                 logger.info(f"[AbuseWordsDB] Abuse word removed: {word}")
                 return True
             
@@ -319,29 +446,88 @@ class AbuseWordsDB:
             list: List of abuse word documents
         """
         try:
-            words = await self.abuse_words_collection.find({}).to_list(length=None)
-            
-            for word in words:
-                word.pop("_id", None)
-            
-            return words
+            return await self.abuse_words_collection.find(
+                {}, projection={"_id": 0}
+            ).to_list(length=None)
         except Exception as e:
             logger.error(f"[AbuseWordsDB] Error getting abuse words: {e}")
             return []
     
+    def _invalidate_word_cache(self):
+        """Drop the cached word list and matcher after the word set changed"""
+        self._word_list = None
+        self._word_set = None
+        self._automaton = None
+    
+    async def _load_word_cache(self):
+        """Fetch all words once and compile them into the matcher"""
+        word_list = []
+        automaton = ahocorasick.Automaton() if ahocorasick is not None else None
+        
+        # Stream straight into the matcher, no intermediate document list
+        cursor = self._raw_words_collection.find(
+            {}, projection={"_id": 0, "word": 1, "severity": 1}
+        )
+        async for raw in cursor:
+            word = raw["word"]
+            word_list.append(word)
+            if automaton is not None:
+                automaton.add_word(word, (raw.get("severity", "high"), word))
+        
+        if automaton is not None and word_list:
+            automaton.make_automaton()
+        else:
+            automaton = None
+        
+        self._word_list = word_list
+        self._word_set = set(word_list)
+        self._automaton = automaton
+    
+    async def get_word_list(self) -> List[str]:
+        """
+        Get all abuse words as plain strings (cached until add/remove)
+        
+        Returns:
+            list: Abuse words
+        """
+        if self._word_list is None:
+            await self._load_word_cache()
+        return self._word_list
+    
+    async def get_matcher(self):
+        """
+        Get an Aho-Corasick automaton over all abuse words (cached until
+        add/remove). Values are (severity, word) tuples.
+        
+        Returns:
+            ahocorasick.Automaton or None if pyahocorasick is unavailable
+        """
+        if self._word_list is None:
+            await self._load_word_cache()
+        return self._automaton
+    
     async def word_exists(self, word: str) -> bool:
         """
         Check if a word exists in abuse list
         
+        Internal callers (e.g. words coming out of the matcher) should pass
+        the normalized form; it is looked up without building a new string.
+        
         Args:
             word: The word to check
             
         Returns:
             bool: True if word exists
         """
+        if self._word_set is not None:
+            return word in self._word_set or self._norm(word) in self._word_set
+        
+        word_lower = self._norm(word)
+        
         try:
             exists = await self.abuse_words_collection.find_one(
-                {"word": word.lower().strip()}
+                {"word": word_lower},
+                projection={"_id": 1}
             )
             return exists is not None
         except Exception as e:
@@ -372,46 +558,37 @@ class AbuseWordsDB:
             int: Total warning count for user
         """
         try:
-            user_warns = await self.user_warnings_collection.find_one({
-                "chat_id": chat_id,
-                "user_id": user_id
-            })
-            
+            now = datetime.utcnow()
             offense = {
                 "word": abusive_word,
                 "message": message_content[:200],
-                "timestamp": datetime.now()
+                "timestamp": now
             }
             
-            if user_warns:
-                warnings = user_warns.get("warnings", 0) + 1
-                offenses = user_warns.get("offenses", [])
-                offenses.append(offense)
-                
-                if len(offenses) > 10:
-                    offenses = offenses[-10:]
-                
-                await self.user_warnings_collection.update_one(
-                    {"chat_id": chat_id, "user_id": user_id},
-                    {
-                        "$set": {
-                            "warnings": warnings,
-                            "offenses": offenses,
-                            "last_offense": datetime.now()
-                        }
-                    }
-                )
-            else:
-                warnings = 1
-                await self.user_warnings_collection.insert_one({
-                    "chat_id": chat_id,
-                    "user_id": user_id,
-                    "warnings": warnings,
-                    "offenses": [offense],
-                    "first_offense": datetime.now(),
-                    "last_offense": datetime.now(),
-                    "created_at": datetime.now()
-                })
+            # Single atomic upsert: no read-modify-write race between messages.
+            # The filter carries the partial index's predicate, so the server
+            # won't retry a duplicate-key upsert itself: when two first
+            # offenses race, the loser retries once and increments the
+            # winner's document instead
+            for attempt in range(2):
+                try:
+                    user_warns = await self.warnings_fast.find_one_and_update(
+                        {"chat_id": chat_id, "user_id": user_id, "warnings": {"$gt": 0}},
+                        {
+                            "$inc": {"warnings": 1},
+                            "$push": {"offenses": {"$each": [offense], "$slice": -10}},
+                            "$set": {"last_offense": now},
+                            "$setOnInsert": {"first_offense": now, "created_at": now}
+                        },
+                        upsert=True,
+                        projection={"warnings": 1, "_id": 0},
+                        return_document=ReturnDocument.AFTER
+                    )
+                    break
+                except DuplicateKeyError:
+                    if attempt:
+                        raise
+            warnings = user_warns["warnings"]
             
             logger.info(f"[AbuseWordsDB] Warning added for {user_id} in {chat_id}: {warnings}")
             return warnings
@@ -431,20 +608,54 @@ class AbuseWordsDB:
             int: Warning count
         """
         try:
-            user_warns = await self.user_warnings_collection.find_one({
-                "chat_id": chat_id,
-                "user_id": user_id
-            })
+            user_warns = await self.user_warnings_collection.find_one(
+                {"chat_id": chat_id, "user_id": user_id, "warnings": {"$gt": 0}},
+                projection={"warnings": 1, "_id": 0}
+            )
             
             return user_warns.get("warnings", 0) if user_warns else 0
         except Exception as e:
             logger.error(f"[AbuseWordsDB] Error getting warnings: {e}")
             return 0
     
+    async def get_warnings_bulk(self, chat_id: int, user_ids: List[int]) -> Dict[int, int]:
+        """
+        Get warning counts for many users in one query
+        
+        Args:
+            chat_id: Telegram group ID
+            user_ids: User IDs
+            
+        Returns:
+            dict: user_id -> warning count (0 for users without warnings)
+        """
+        warnings = {user_id: 0 for user_id in user_ids}
+        if not warnings:
+            return warnings
+        
+        try:
+            cursor = self.user_warnings_collection.find(
+                {
+                    "chat_id": chat_id,
+                    "user_id": {"$in": list(warnings)},
+                    "warnings": {"$gt": 0}
+                },
+                projection={"_id": 0, "user_id": 1, "warnings": 1}
+            )
+            async for doc in cursor:
+                warnings[doc["user_id"]] = doc.get("warnings", 0)
+        except Exception as e:
+            logger.error(f"[AbuseWordsDB] Error getting bulk warnings: {e}")
+        
+        return warnings
+    
     async def clear_warnings(self, chat_id: int, user_id: int) -> bool:
         """
         Clear all warnings for a user
         
+        Warnings also clear themselves: a TTL index on last_offense removes
+        a user's record WARNING_TTL (30 days) after their latest offense.
+        
         Args:
             chat_id: Telegram group ID
             user_id: User ID
@@ -455,7 +666,8 @@ class AbuseWordsDB:
         try:
             result = await self.user_warnings_collection.delete_one({
                 "chat_id": chat_id,
-                "user_id": user_id
+                "user_id": user_id,
+                "warnings": {"$gt": 0}
             })
             
             if result.deleted_count > 0:
@@ -494,7 +706,8 @@ class AbuseWordsDB:
         try:
             user_warns = await self.user_warnings_collection.find_one({
                 "chat_id": chat_id,
-                "user_id": user_id
+                "user_id": user_id,
+                "warnings": {"$gt": 0}
             })
             
             if user_warns:
@@ -529,8 +742,11 @@ class AbuseWordsDB:
             action_taken: Action taken (mute, ban, delete, etc.)
             
         Returns:
-            bool: True if successful
+            bool: True if queued, False for an empty message
         """
+        if not message:
+            return False
+        
         try:
             log_entry = {
                 "chat_id": chat_id,
@@ -538,16 +754,66 @@ class AbuseWordsDB:
                 "detected_word": detected_word,
                 "message": message[:300],
                 "action_taken": action_taken,
-                "timestamp": datetime.now()
+                "timestamp": datetime.utcnow()
             }
             
-            await self.abuse_history_collection.insert_one(log_entry)
-            logger.debug(f"[AbuseWordsDB] Abuse logged: {detected_word} by {user_id}")
+            self.start_history_flusher()
+            self._history_queue.put_nowait(log_entry)
+            logger.debug(f"[AbuseWordsDB] Abuse queued: {detected_word} by {user_id}")
             return True
         except Exception as e:
             logger.error(f"[AbuseWordsDB] Error logging abuse: {e}")
             return False
     
+    def start_history_flusher(self):
+        """Start the background task that batches abuse_history inserts"""
+        if self._history_task is None or self._history_task.done():
+            self._history_task = asyncio.create_task(self._history_flusher())
+    
+    async def _history_flusher(self):
+        """Drain queued history entries and insert them in bulk"""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        
+        while not stopping:
+            entry = await self._history_queue.get()
+            if entry is None:
+                break
+            
+            batch = [entry]
+            deadline = loop.time() + HISTORY_FLUSH_INTERVAL
+            while len(batch) < HISTORY_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self._history_queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if entry is None:
+                    stopping = True
+                    break
+                batch.append(entry)
+            
+            await self._insert_history(batch)
+    
+    async def _insert_history(self, batch: List[Dict[str, Any]]):
+        try:
+            await self.abuse_history_fast.insert_many(batch, ordered=False)
+            logger.debug(f"[AbuseWordsDB] Flushed {len(batch)} abuse history entries")
+        except Exception as e:
+            logger.error(f"[AbuseWordsDB] Error flushing abuse history: {e}")
+    
+    async def flush_history(self):
+        """
+        Stop the background flusher after it wrote everything queued.
+        Call on shutdown.
+        """
+        if self._history_task and not self._history_task.done():
+            self._history_queue.put_nowait(None)
+            await self._history_task
+        self._history_task = None
+    
     async def get_recent_abuses(self, chat_id: int, limit: int = 50) -> List[Dict[str, Any]]:
         """
         Get recent abuse detections in a chat
@@ -560,14 +826,11 @@ class AbuseWordsDB:
             list: Recent abuse logs
         """
         try:
-            logs = await self.abuse_history_collection.find(
-                {"chat_id": chat_id}
-            ).sort("timestamp", -1).limit(limit).to_list(length=limit)
+            cursor = self.abuse_history_ro.find(
+                {"chat_id": chat_id}, projection={"_id": 0}
+            ).sort("timestamp", -1).limit(limit).batch_size(limit)
             
-            for log in logs:
-                log.pop("_id", None)
-            
-            return logs
+            return [log async for log in cursor]
         except Exception as e:
             logger.error(f"[AbuseWordsDB] Error getting recent abuses: {e}")
             return []
@@ -587,23 +850,29 @@ class AbuseWordsDB:
             dict: Statistics
         """
         try:
-            config = await self.get_config(chat_id)
-            
-            total_words = await self.abuse_words_collection.count_documents({})
-            total_violations = await self.abuse_history_collection.count_documents({"chat_id": chat_id})
-            
-            warned_users = await self.user_warnings_collection.count_documents({
-                "chat_id": chat_id
-            })
-            
+            # One $facet pass over the chat's history for both total and top-5
             pipeline = [
                 {"$match": {"chat_id": chat_id}},
-                {"$group": {"_id": "$detected_word", "count": {"$sum": 1}}},
-                {"$sort": {"count": -1}},
-                {"$limit": 5}
+                {"$facet": {
+                    "total": [{"$count": "n"}],
+                    "top": [
+                        {"$group": {"_id": "$detected_word", "count": {"$sum": 1}}},
+                        {"$sort": {"count": -1}},
+                        {"$limit": 5}
+                    ]
+                }}
             ]
             
-            most_common = await self.abuse_history_collection.aggregate(pipeline).to_list(length=5)
+            config, total_words, warned_users, facets = await asyncio.gather(
+                self.get_config(chat_id),
+                self.abuse_words_collection.estimated_document_count(),
+                self.user_warnings_ro.count_documents({"chat_id": chat_id}),
+                self.abuse_history_ro.aggregate(pipeline).to_list(length=1)
+            )
+            
+            facet = facets[0] if facets else {}
+            total_violations = facet["total"][0]["n"] if facet.get("total") else 0
+            most_common = facet.get("top", [])
             
             return {
                 "enabled": config.get("enabled", True),
@@ -626,29 +895,6 @@ class AbuseWordsDB:
     # Cleanup & Maintenance
     # ────────────────────────────────────────────────────────────
     
-    async def cleanup_old_history(self, days: int = 7) -> bool:
-        """
-        Clean up old abuse history
-        
-        Args:
-            days: Delete records older than N days
-            
-        Returns:
-            bool: True if successful
-        """
-        try:
-            cutoff = datetime.now() - timedelta(days=days)
-            
-            result = await self.abuse_history_collection.delete_many({
-                "timestamp": {"$lt": cutoff}
-            })
-            
-            logger.info(f"[AbuseWordsDB] Deleted {result.deleted_count} old history records")
-            return True
-        except Exception as e:
-            logger.error(f"[AbuseWordsDB] Error cleaning up history: {e}")
-            return False
-    
     async def reset_chat_warnings(self, chat_id: int) -> bool:
         """
         Reset all warnings for a chat
@@ -692,6 +938,12 @@ async def init_abuse_words_db(mongo_db: AsyncIOMotorDatabase) -> AbuseWordsDB:
     
     abuse_words_db = AbuseWordsDB(mongo_db)
     await abuse_words_db.create_indexes()
+    abuse_words_db.start_history_flusher()
     logger.info("[AbuseWordsDB] Initialized successfully")
     
     return abuse_words_db
+
+
+def get_abuse_words_db() -> Optional[AbuseWordsDB]:
+    """Get the abuse words database (None until init_abuse_words_db ran)"""
+    return abuse_words_db
@@ -4,25 +4,56 @@ Handles MongoDB operations for anti-edit functionality.
 
 Collections:
 - antiedit_config: Stores enable/disable status per group
-- authorized_users: Stores users authorized to edit per group
+- authorized_users: One document per group holding its authorized user IDs
 - edit_logs: Logs all edit actions for analytics
 
 Author: Vivaan Devs
 Version: 4.0
 """
 
+from __future__ import annotations
+
+import asyncio
+import functools
 import logging
-from typing import Optional, List, Dict, Any
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional, Iterable, List, Dict, Any, Set, Tuple
 from datetime import datetime, timedelta
 
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
-from pymongo.errors import PyMongoError, DuplicateKeyError
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError, OperationFailure
+from pymongo.write_concern import WriteConcern
 
-from config import MONGO_DB_URI
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
 
 # Logger setup
 logger = logging.getLogger(__name__)
 
+# Edit logs are written in batches by a background flusher
+LOG_BATCH_SIZE = 500
+LOG_FLUSH_INTERVAL = 0.05  # seconds
+
+# Per-chat config cache: entries live this long, least recently used
+# chats are evicted beyond the size cap
+CONFIG_CACHE_TTL = 60.0  # seconds
+CONFIG_CACHE_MAX = 4096
+
+# One-off data migrations; completion is recorded in the meta collection
+CONFIG_TIMESTAMPS_MARKER = "antiedit_config_timestamps_v1"
+AUTHORIZED_USERS_MARKER = "authorized_users_array_v1"
+
+
+@functools.lru_cache(maxsize=8)
+def _cutoff_at(days: int, second: int) -> datetime:
+    return datetime.utcnow() - timedelta(days=days)
+
+
+def _cutoff(days: int) -> datetime:
+    """UTC time N days ago, recomputed at most once per second."""
+    return _cutoff_at(days, int(time.monotonic()))
+
 
 class EditTrackerDB:
     """
@@ -32,14 +63,36 @@ class EditTrackerDB:
     
     def __init__(self):
         """Initialize MongoDB connection and collections."""
+        # Shares the bot's client (and its connection pool) instead of
+        # opening a second one
+        from VIVAANXMUSIC.core.mongo import _mongo_async_
+        
         try:
-            self.client: AsyncIOMotorClient = AsyncIOMotorClient(MONGO_DB_URI)
+            self.client: AsyncIOMotorClient = _mongo_async_
             self.db: AsyncIOMotorDatabase = self.client.VivaanXMusic
             
             # Collections
             self.config_collection: AsyncIOMotorCollection = self.db.antiedit_config
             self.authorized_collection: AsyncIOMotorCollection = self.db.authorized_users
-            self.logs_collection: AsyncIOMotorCollection = self.db.edit_logs
+            # Logs expire after 30 days anyway; skip waiting for journal/replicas
+            self.logs_collection: AsyncIOMotorCollection = self.db.get_collection(
+                "edit_logs",
+                write_concern=WriteConcern(w=1, j=False)
+            )
+            
+            # Per-chat config cache: chat_id -> (fetched_at, config or None)
+            self._config_cache: OrderedDict[int, Tuple[float, Optional[Dict[str, Any]]]] = OrderedDict()
+            
+            # Per-chat authorized user IDs, loaded on first check and kept in
+            # step with add/remove/clear; the generation counter stops a load
+            # that raced a change from storing a stale set
+            self._authz_cache: Dict[int, Set[int]] = {}
+            self._authz_gen: Dict[int, int] = {}
+            self._authz_locks: Dict[int, asyncio.Lock] = {}
+            
+            # Pending edit log entries; None is the flusher's stop signal
+            self._log_queue: asyncio.Queue = asyncio.Queue()
+            self._log_task: Optional[asyncio.Task] = None
             
             logger.info("EditTrackerDB initialized successfully")
             
@@ -53,27 +106,100 @@ class EditTrackerDB:
         Should be called once during bot startup.
         """
         try:
-            # Index for config collection
-            await self.config_collection.create_index("chat_id", unique=True)
-            
-            # Compound index for authorized users
-            await self.authorized_collection.create_index(
-                [("chat_id", 1), ("user_id", 1)],
-                unique=True
+            # Independent DDL commands, sent together
+            await asyncio.gather(
+                # Index for config collection
+                self.config_collection.create_index("chat_id", unique=True),
+                
+                # Indexes for logs collection
+                self.logs_collection.create_index(
+                    [("chat_id", 1), ("timestamp", -1)]
+                ),
+                # Serves get_user_edit_count's chat/user/time-range filter
+                self.logs_collection.create_index(
+                    [("chat_id", 1), ("user_id", 1), ("timestamp", -1)]
+                ),
+                self.logs_collection.create_index("timestamp", expireAfterSeconds=2592000)  # 30 days TTL
             )
-            await self.authorized_collection.create_index("chat_id")
             
-            # Indexes for logs collection
-            await self.logs_collection.create_index(
-                [("chat_id", 1), ("timestamp", -1)]
-            )
-            await self.logs_collection.create_index("timestamp", expireAfterSeconds=2592000)  # 30 days TTL
+            # Timestamps written by older versions are never read
+            await self._run_migration(CONFIG_TIMESTAMPS_MARKER, self._migrate_config_timestamps)
+            
+            # Authorized users: fold per-user docs into one doc per chat, then
+            # swap the per-user compound index for a unique chat_id one
+            await self._run_migration(AUTHORIZED_USERS_MARKER, self._migrate_authorized_users)
+            try:
+                await self.authorized_collection.drop_index("chat_id_1_user_id_1")
+            except OperationFailure:
+                pass
+            try:
+                await self.authorized_collection.create_index("chat_id", unique=True)
+            except OperationFailure:
+                # Non-unique chat_id index left by older versions
+                await self.authorized_collection.drop_index("chat_id_1")
+                await self.authorized_collection.create_index("chat_id", unique=True)
             
             logger.info("MongoDB indexes created successfully")
             
         except Exception as e:
             logger.error(f"Error creating indexes: {e}", exc_info=True)
     
+    async def _run_migration(self, marker: str, migrate):
+        """
+        Run a data migration unless the meta collection already records it.
+        Its filters scan unindexed fields, so they must not run every boot.
+        
+        Args:
+            marker: _id of the completion document in meta
+            migrate: Coroutine function doing the migration
+        """
+        if await self.db.meta.find_one({"_id": marker}):
+            return
+        await migrate()
+        await self.db.meta.update_one(
+            {"_id": marker},
+            {"$set": {"done": True}},
+            upsert=True
+        )
+    
+    async def _migrate_config_timestamps(self):
+        """Drop the created_at/updated_at fields older versions stored."""
+        result = await self.config_collection.update_many(
+            {"$or": [
+                {"updated_at": {"$exists": True}},
+                {"created_at": {"$exists": True}}
+            ]},
+            {"$unset": {"updated_at": "", "created_at": ""}}
+        )
+        if result.modified_count:
+            logger.info(f"Removed timestamps from {result.modified_count} anti-edit configs")
+    
+    async def _migrate_authorized_users(self):
+        """
+        Move authorizations stored one document per user (older versions)
+        into the per-chat users array. A no-op once none are left; safe to
+        re-run if interrupted, since $addToSet ignores users already there.
+        """
+        legacy = {"user_id": {"$exists": True}}
+        groups = await self.authorized_collection.aggregate([
+            {"$match": legacy},
+            {"$group": {"_id": "$chat_id", "users": {"$addToSet": "$user_id"}}}
+        ]).to_list(length=None)
+        
+        if not groups:
+            return
+        
+        await self.authorized_collection.bulk_write([
+            UpdateOne(
+                {"chat_id": group["_id"], "user_id": {"$exists": False}},
+                {"$addToSet": {"users": {"$each": group["users"]}}},
+                upsert=True
+            )
+            for group in groups
+        ], ordered=False)
+        result = await self.authorized_collection.delete_many(legacy)
+        logger.info(f"Migrated {result.deleted_count} authorized users into {len(groups)} chat documents")
+    
     # ==================== CONFIG OPERATIONS ====================
     
     async def enable_antiedit(self, chat_id: int) -> bool:
@@ -87,20 +213,7 @@ class EditTrackerDB:
             bool: True if successful, False otherwise
         """
         try:
-            await self.config_collection.update_one(
-                {"chat_id": chat_id},
-                {
-                    "$set": {
-                        "enabled": True,
-                        "updated_at": datetime.utcnow()
-                    },
-                    "$setOnInsert": {
-                        "chat_id": chat_id,
-                        "created_at": datetime.utcnow()
-                    }
-                },
-                upsert=True
-            )
+            await self._update_fields(chat_id, {"enabled": True})
             logger.info(f"Anti-edit enabled for chat {chat_id}")
             return True
             
@@ -119,20 +232,7 @@ class EditTrackerDB:
             bool: True if successful, False otherwise
         """
         try:
-            await self.config_collection.update_one(
-                {"chat_id": chat_id},
-                {
-                    "$set": {
-                        "enabled": False,
-                        "updated_at": datetime.utcnow()
-                    },
-                    "$setOnInsert": {
-                        "chat_id": chat_id,
-                        "created_at": datetime.utcnow()
-                    }
-                },
-                upsert=True
-            )
+            await self._update_fields(chat_id, {"enabled": False})
             logger.info(f"Anti-edit disabled for chat {chat_id}")
             return True
             
@@ -140,6 +240,22 @@ class EditTrackerDB:
             logger.error(f"Error disabling anti-edit for chat {chat_id}: {e}")
             return False
     
+    async def _update_fields(self, chat_id: int, fields: Dict[str, Any]):
+        """
+        Upsert config fields in a single write and drop the cached copy.
+        
+        Args:
+            chat_id: Telegram chat ID
+            fields: Fields to $set
+        """
+        # An upsert copies chat_id from the filter, no $setOnInsert needed
+        await self.config_collection.update_one(
+            {"chat_id": chat_id},
+            {"$set": fields},
+            upsert=True
+        )
+        self._config_cache.pop(chat_id, None)
+    
     async def is_antiedit_enabled(self, chat_id: int) -> bool:
         """
         Check if anti-edit is enabled for a group.
@@ -150,18 +266,13 @@ class EditTrackerDB:
         Returns:
             bool: True if enabled, False if disabled or not configured
         """
-        try:
-            config = await self.config_collection.find_one({"chat_id": chat_id})
-            
-            if config is None:
-                # Default: disabled if not configured
-                return False
-            
-            return config.get("enabled", False)
-            
-        except PyMongoError as e:
-            logger.error(f"Error checking anti-edit status for chat {chat_id}: {e}")
+        config = await self.get_config(chat_id)
+        
+        if config is None:
+            # Default: disabled if not configured
             return False
+        
+        return config.get("enabled", False)
     
     async def get_config(self, chat_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -173,9 +284,21 @@ class EditTrackerDB:
         Returns:
             Optional[Dict]: Configuration dict or None if not found
         """
+        cached = self._config_cache.get(chat_id)
+        if cached and time.monotonic() - cached[0] < CONFIG_CACHE_TTL:
+            self._config_cache.move_to_end(chat_id)
+            return dict(cached[1]) if cached[1] is not None else None
+        
         try:
-            config = await self.config_collection.find_one({"chat_id": chat_id})
-            return config
+            config = await self.config_collection.find_one(
+                {"chat_id": chat_id},
+                projection={"_id": 0}
+            )
+            self._config_cache[chat_id] = (time.monotonic(), config)
+            self._config_cache.move_to_end(chat_id)
+            if len(self._config_cache) > CONFIG_CACHE_MAX:
+                self._config_cache.popitem(last=False)
+            return dict(config) if config is not None else None
             
         except PyMongoError as e:
             logger.error(f"Error getting config for chat {chat_id}: {e}")
@@ -195,22 +318,56 @@ class EditTrackerDB:
             bool: True if successful, False otherwise
         """
         try:
-            await self.authorized_collection.insert_one({
-                "chat_id": chat_id,
-                "user_id": user_id,
-                "authorized_at": datetime.utcnow()
-            })
-            logger.info(f"User {user_id} authorized in chat {chat_id}")
-            return True
+            result = await self.authorized_collection.update_one(
+                {"chat_id": chat_id},
+                {"$addToSet": {"users": user_id}},
+                upsert=True
+            )
+            self._authz_changed(chat_id, add=user_id)
+            
+            if result.modified_count or result.upserted_id is not None:
+                logger.info(f"User {user_id} authorized in chat {chat_id}")
+            else:
+                logger.debug(f"User {user_id} already authorized in chat {chat_id}")
             
-        except DuplicateKeyError:
-            logger.debug(f"User {user_id} already authorized in chat {chat_id}")
-            return True  # Already authorized, still success
+            return True  # Already authorized is still success
             
         except PyMongoError as e:
             logger.error(f"Error authorizing user {user_id} in chat {chat_id}: {e}")
             return False
     
+    async def add_authorized_users(self, chat_id: int, user_ids: Iterable[int]) -> bool:
+        """
+        Authorize many users in a group with a single update.
+        
+        Args:
+            chat_id: Telegram chat ID
+            user_ids: Telegram user IDs to authorize
+            
+        Returns:
+            bool: True if every user is now authorized, False otherwise
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        if not user_ids:
+            return True
+        
+        try:
+            await self.authorized_collection.update_one(
+                {"chat_id": chat_id},
+                {"$addToSet": {"users": {"$each": user_ids}}},
+                upsert=True
+            )
+            
+        except PyMongoError as e:
+            self._authz_changed(chat_id, clear=True)
+            logger.error(f"Error authorizing users in chat {chat_id}: {e}")
+            return False
+        
+        for user_id in user_ids:
+            self._authz_changed(chat_id, add=user_id)
+        logger.info(f"{len(user_ids)} users authorized in chat {chat_id}")
+        return True
+    
     async def remove_authorized_user(self, chat_id: int, user_id: int) -> bool:
         """
         Remove a user from the authorized list for a group.
@@ -223,12 +380,13 @@ class EditTrackerDB:
             bool: True if successful, False otherwise
         """
         try:
-            result = await self.authorized_collection.delete_one({
-                "chat_id": chat_id,
-                "user_id": user_id
-            })
+            result = await self.authorized_collection.update_one(
+                {"chat_id": chat_id},
+                {"$pull": {"users": user_id}}
+            )
+            self._authz_changed(chat_id, discard=user_id)
             
-            if result.deleted_count > 0:
+            if result.modified_count > 0:
                 logger.info(f"User {user_id} deauthorized from chat {chat_id}")
             else:
                 logger.debug(f"User {user_id} was not in authorized list for chat {chat_id}")
@@ -251,17 +409,61 @@ class EditTrackerDB:
             bool: True if authorized, False otherwise
         """
         try:
-            authorized = await self.authorized_collection.find_one({
-                "chat_id": chat_id,
-                "user_id": user_id
-            })
-            
-            return authorized is not None
+            return user_id in await self._authorized_set(chat_id)
             
         except PyMongoError as e:
             logger.error(f"Error checking authorization for user {user_id} in chat {chat_id}: {e}")
             return False
     
+    async def _authorized_set(self, chat_id: int) -> Set[int]:
+        """
+        Cached set of authorized user IDs for a chat.
+        Concurrent first checks for a chat share one query.
+        
+        Raises:
+            PyMongoError: If the initial load fails (nothing is cached)
+        """
+        users = self._authz_cache.get(chat_id)
+        if users is not None:
+            return users
+        
+        lock = self._authz_locks.setdefault(chat_id, asyncio.Lock())
+        async with lock:
+            users = self._authz_cache.get(chat_id)
+            if users is None:
+                generation = self._authz_gen.get(chat_id, 0)
+                doc = await self.authorized_collection.find_one(
+                    {"chat_id": chat_id},
+                    projection={"_id": 0, "users": 1}
+                )
+                users = set(doc.get("users", ())) if doc else set()
+                if self._authz_gen.get(chat_id, 0) == generation:
+                    self._authz_cache[chat_id] = users
+        self._authz_locks.pop(chat_id, None)
+        
+        return users
+    
+    def _authz_changed(
+        self,
+        chat_id: int,
+        add: Optional[int] = None,
+        discard: Optional[int] = None,
+        clear: bool = False
+    ):
+        """Apply a stored authorization change to the cached set."""
+        self._authz_gen[chat_id] = self._authz_gen.get(chat_id, 0) + 1
+        
+        if clear:
+            self._authz_cache.pop(chat_id, None)
+            return
+        
+        users = self._authz_cache.get(chat_id)
+        if users is not None:
+            if add is not None:
+                users.add(add)
+            if discard is not None:
+                users.discard(discard)
+    
     async def get_authorized_users(self, chat_id: int) -> List[int]:
         """
         Get list of all authorized users in a group.
@@ -273,13 +475,12 @@ class EditTrackerDB:
             List[int]: List of authorized user IDs
         """
         try:
-            cursor = self.authorized_collection.find({"chat_id": chat_id})
-            authorized_users = []
-            
-            async for doc in cursor:
-                authorized_users.append(doc["user_id"])
+            doc = await self.authorized_collection.find_one(
+                {"chat_id": chat_id},
+                projection={"_id": 0, "users": 1}
+            )
             
-            return authorized_users
+            return list(doc.get("users", [])) if doc else []
             
         except PyMongoError as e:
             logger.error(f"Error getting authorized users for chat {chat_id}: {e}")
@@ -296,8 +497,13 @@ class EditTrackerDB:
             bool: True if successful, False otherwise
         """
         try:
-            result = await self.authorized_collection.delete_many({"chat_id": chat_id})
-            logger.info(f"Cleared {result.deleted_count} authorized users from chat {chat_id}")
+            doc = await self.authorized_collection.find_one_and_delete(
+                {"chat_id": chat_id},
+                projection={"_id": 0, "users": 1}
+            )
+            self._authz_changed(chat_id, clear=True)
+            cleared = len(doc.get("users", [])) if doc else 0
+            logger.info(f"Cleared {cleared} authorized users from chat {chat_id}")
             return True
             
         except PyMongoError as e:
@@ -336,14 +542,64 @@ class EditTrackerDB:
                 "timestamp": timestamp or datetime.utcnow()
             }
             
-            await self.logs_collection.insert_one(log_entry)
-            logger.debug(f"Logged edit action: {action} for message {message_id} in chat {chat_id}")
+            self.start_log_flusher()
+            self._log_queue.put_nowait(log_entry)
+            logger.debug(f"Queued edit action: {action} for message {message_id} in chat {chat_id}")
             return True
             
-        except PyMongoError as e:
+        except Exception as e:
             logger.error(f"Error logging edit action: {e}")
             return False
     
+    def start_log_flusher(self):
+        """Start the background task that batches edit log inserts."""
+        if self._log_task is None or self._log_task.done():
+            self._log_task = asyncio.create_task(self._log_flusher())
+    
+    async def _log_flusher(self):
+        """Drain queued log entries and insert them in bulk."""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        
+        while not stopping:
+            entry = await self._log_queue.get()
+            if entry is None:
+                break
+            
+            batch = [entry]
+            deadline = loop.time() + LOG_FLUSH_INTERVAL
+            while len(batch) < LOG_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self._log_queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if entry is None:
+                    stopping = True
+                    break
+                batch.append(entry)
+            
+            await self._insert_logs(batch)
+    
+    async def _insert_logs(self, batch: List[Dict[str, Any]]):
+        try:
+            await self.logs_collection.insert_many(batch, ordered=False)
+            logger.debug(f"Flushed {len(batch)} edit log entries")
+        except PyMongoError as e:
+            logger.error(f"Error flushing edit logs: {e}")
+    
+    async def flush_logs(self):
+        """
+        Stop the background flusher after it wrote everything queued.
+        Call on shutdown.
+        """
+        if self._log_task and not self._log_task.done():
+            self._log_queue.put_nowait(None)
+            await self._log_task
+        self._log_task = None
+    
     async def get_edit_logs(
         self,
         chat_id: int,
@@ -366,22 +622,23 @@ class EditTrackerDB:
             
             # Add time filter if specified
             if days:
-                cutoff_date = datetime.utcnow() - timedelta(days=days)
+                cutoff_date = _cutoff(days)
                 query["timestamp"] = {"$gte": cutoff_date}
             
             cursor = self.logs_collection.find(query).sort("timestamp", -1).limit(limit)
-            
-            logs = []
-            async for log in cursor:
-                logs.append(log)
-            
-            return logs
+            return await cursor.to_list(length=limit)
             
         except PyMongoError as e:
             logger.error(f"Error getting edit logs for chat {chat_id}: {e}")
             return []
     
-    async def get_user_edit_count(self, chat_id: int, user_id: int, days: int = 7) -> int:
+    async def get_user_edit_count(
+        self,
+        chat_id: int,
+        user_id: int,
+        days: int = 7,
+        limit: int = 50
+    ) -> int:
         """
         Get count of edits by a user in last N days.
         
@@ -389,18 +646,23 @@ class EditTrackerDB:
             chat_id: Telegram chat ID
             user_id: Telegram user ID
             days: Number of days to look back
+            limit: Stop counting here; callers compare against a small
+                threshold, so spammers do not cost a full range scan
             
         Returns:
-            int: Number of edits
+            int: Number of edits, at most limit
         """
         try:
-            cutoff_date = datetime.utcnow() - timedelta(days=days)
+            cutoff_date = _cutoff(days)
             
-            count = await self.logs_collection.count_documents({
-                "chat_id": chat_id,
-                "user_id": user_id,
-                "timestamp": {"$gte": cutoff_date}
-            })
+            count = await self.logs_collection.count_documents(
+                {
+                    "chat_id": chat_id,
+                    "user_id": user_id,
+                    "timestamp": {"$gte": cutoff_date}
+                },
+                limit=limit
+            )
             
             return count
             
@@ -421,11 +683,13 @@ class EditTrackerDB:
             bool: True if successful, False otherwise
         """
         try:
-            # Remove config
-            await self.config_collection.delete_one({"chat_id": chat_id})
-            
-            # Remove authorized users
-            await self.authorized_collection.delete_many({"chat_id": chat_id})
+            # Remove config and authorized users together
+            await asyncio.gather(
+                self.config_collection.delete_one({"chat_id": chat_id}),
+                self.authorized_collection.delete_one({"chat_id": chat_id})
+            )
+            self._config_cache.pop(chat_id, None)
+            self._authz_changed(chat_id, clear=True)
             
             # Note: Logs are kept for analytics (will expire via TTL index)
             
@@ -444,15 +708,34 @@ class EditTrackerDB:
             Dict: Statistics including total groups, authorized users, etc.
         """
         try:
-            total_groups = await self.config_collection.count_documents({})
-            enabled_groups = await self.config_collection.count_documents({"enabled": True})
-            total_authorized = await self.authorized_collection.count_documents({})
-            
             # Get recent activity (last 24 hours)
-            yesterday = datetime.utcnow() - timedelta(days=1)
-            recent_edits = await self.logs_collection.count_documents({
-                "timestamp": {"$gte": yesterday}
-            })
+            yesterday = _cutoff(1)
+            
+            group_counts, total_authorized, recent_edits = await asyncio.gather(
+                # Total and enabled groups in one pass over the configs
+                self.config_collection.aggregate([
+                    {"$group": {
+                        "_id": None,
+                        "total": {"$sum": 1},
+                        "enabled": {"$sum": {"$cond": [{"$eq": ["$enabled", True]}, 1, 0]}}
+                    }}
+                ]).to_list(length=1),
+                # Sum of the per-chat users array sizes
+                self.authorized_collection.aggregate([
+                    {"$group": {
+                        "_id": None,
+                        "total": {"$sum": {"$size": {"$ifNull": ["$users", []]}}}
+                    }}
+                ]).to_list(length=1),
+                self.logs_collection.count_documents({
+                    "timestamp": {"$gte": yesterday}
+                })
+            )
+            
+            counts = group_counts[0] if group_counts else {}
+            total_authorized = total_authorized[0]["total"] if total_authorized else 0
+            total_groups = counts.get("total", 0)
+            enabled_groups = counts.get("enabled", 0)
             
             return {
                 "total_groups": total_groups,
@@ -467,10 +750,10 @@ class EditTrackerDB:
             return {}
     
     async def close(self):
-        """Close MongoDB connection."""
+        """Write out queued edit logs; the shared client stays open."""
         try:
-            self.client.close()
-            logger.info("EditTrackerDB connection closed")
+            await self.flush_logs()
+            logger.info("EditTrackerDB closed")
         except Exception as e:
             logger.error(f"Error closing EditTrackerDB connection: {e}")
 
@@ -522,6 +805,12 @@ async def add_authorized_user(chat_id: int, user_id: int) -> bool:
     return await db.add_authorized_user(chat_id, user_id)
 
 
+async def add_authorized_users(chat_id: int, user_ids: Iterable[int]) -> bool:
+    """Add many authorized users."""
+    db = get_edit_tracker_db()
+    return await db.add_authorized_users(chat_id, user_ids)
+
+
 async def remove_authorized_user(chat_id: int, user_id: int) -> bool:
     """Remove authorized user."""
     db = get_edit_tracker_db()
@@ -571,6 +860,7 @@ async def initialize_database():
     """
     db = get_edit_tracker_db()
     await db.create_indexes()
+    db.start_log_flusher()
     logger.info("Edit tracker database initialized and indexed")
 
 
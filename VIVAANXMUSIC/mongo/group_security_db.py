@@ -4,9 +4,14 @@ Handles bio checking configurations, warnings, and user whitelists
 Part of VivaanXMusic Group Management System
 """
 
+import asyncio
+import logging
 from typing import Dict, List, Optional
+from pymongo import ReturnDocument
 from VIVAANXMUSIC.core.mongo import mongodb
 
+logger = logging.getLogger(__name__)
+
 # Database collections
 security_db = mongodb.group_security
 
@@ -20,6 +25,22 @@ class GroupSecurityDB:
         self.warnings = security_db.warnings
         self.whitelist = security_db.whitelist
     
+    async def create_indexes(self):
+        """
+        Create indexes for config, warning and whitelist lookups.
+        Should be called once during bot startup.
+        """
+        # The (chat_id, user_id) prefix also serves the per-chat list/clear queries
+        results = await asyncio.gather(
+            self.configs.create_index("chat_id", unique=True),
+            self.warnings.create_index([("chat_id", 1), ("user_id", 1)], unique=True),
+            self.whitelist.create_index([("chat_id", 1), ("user_id", 1)], unique=True),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"Group security index creation failed: {result}")
+    
     # ==================== Configuration Management ====================
     
     async def get_config(self, chat_id: int) -> Dict:
@@ -32,19 +53,19 @@ class GroupSecurityDB:
         Returns:
             Dict: Configuration with bio_check settings
         """
-        config = await self.configs.find_one({"chat_id": chat_id})
-        if not config:
-            # Default configuration
-            config = {
-                "chat_id": chat_id,
+        # Read, or atomically create with defaults, in one round trip
+        return await self.configs.find_one_and_update(
+            {"chat_id": chat_id},
+            {"$setOnInsert": {
                 "bio_check": {
                     "enabled": True,
                     "warning_limit": 5,
                     "action": "mute"  # "mute" or "ban"
                 }
-            }
-            await self.configs.insert_one(config)
-        return config
+            }},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
     
     async def update_bio_config(self, chat_id: int, warning_limit: int, action: str):
         """
@@ -109,12 +130,15 @@ class GroupSecurityDB:
         Returns:
             int: New warning count
         """
-        await self.warnings.update_one(
+        # Increment and read back in one round trip
+        doc = await self.warnings.find_one_and_update(
             {"chat_id": chat_id, "user_id": user_id},
             {"$inc": {"count": 1}},
-            upsert=True
+            projection={"count": 1, "_id": 0},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
         )
-        return await self.get_warnings(chat_id, user_id)
+        return doc.get("count", 0) if doc else 0
     
     async def clear_warnings(self, chat_id: int, user_id: int):
         """
@@ -155,11 +179,12 @@ class GroupSecurityDB:
         Returns:
             bool: True if whitelisted
         """
-        doc = await self.whitelist.find_one({
-            "chat_id": chat_id,
-            "user_id": user_id
-        })
-        return doc is not None
+        # Existence only: stop at the first index match, decode no document
+        count = await self.whitelist.count_documents(
+            {"chat_id": chat_id, "user_id": user_id},
+            limit=1
+        )
+        return count > 0
     
     async def add_whitelist(self, chat_id: int, user_id: int, username: str = None):
         """
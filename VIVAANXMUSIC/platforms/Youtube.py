@@ -1,8 +1,16 @@
 import asyncio
+import concurrent.futures
 import os
+import pickle
+import random
 import re
+import sqlite3
+import threading
 import time
-from typing import Union
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Dict, Optional, Tuple, Union
 import yt_dlp
 import aiohttp
 from pyrogram.enums import MessageEntityType
@@ -17,47 +25,296 @@ logger = LOGGER(__name__)
 # CONFIGURATION - MULTIPLE FREE APIs
 # ============================================================================
 CACHE_TIME = 3600  # 1 hour
+METADATA_TTL = 600  # search results reused by details/title/duration/thumbnail/track
+METADATA_CACHE_MAX = 4096
 DOWNLOADS_FOLDER = "downloads"
+META_CACHE_DB = os.path.join(DOWNLOADS_FOLDER, "ytmeta.sqlite")
+META_CACHE_MAX = 1024
+YTDLP_THREADS = 4
+YTDLP_META_THREADS = 2  # metadata lookups never queue behind downloads
 
 MAX_API_RETRIES = 2
 MAX_YTDLP_RETRIES = 2
 RETRY_DELAY = 0.3
+MAX_BACKOFF = 8.0
 API_TIMEOUT = 12
+CB_THRESHOLD = 5  # consecutive failed calls before an API is skipped
+CB_COOLDOWN = 300  # seconds an open circuit skips the API before one probe
 DOWNLOAD_TIMEOUT = 300
+DOWNLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+WRITEV_MAX_BUFFERS = 512  # stays under IOV_MAX (1024 on Linux)
 
 # ✅ MULTIPLE FREE APIs (AGE-BYPASS)
-FREE_APIS = [
-    {
-        "name": "SocialDown",
-        "url": "https://socialdown.itz-ashlynn.workers.dev/yt",
-        "method": "GET",
-        "params": lambda url, fmt: {"url": url, "format": fmt}
+@dataclass(frozen=True)
+class ApiConfig:
+    name: str
+    url: str
+    method: str
+    build: Callable[[str, str], dict]
+    as_json: bool = False
+
+
+def _build_params(extra: dict, url: str, fmt: str, url_key: str = "url", fmt_key: str = None) -> dict:
+    """Build the request params for a single API call"""
+    params = {url_key: url, **extra}
+    if fmt_key:
+        params[fmt_key] = fmt
+    return params
+
+
+FREE_APIS = (
+    ApiConfig(
+        name="SocialDown",
+        url="https://socialdown.itz-ashlynn.workers.dev/yt",
+        method="GET",
+        build=partial(_build_params, {}, fmt_key="format"),
+    ),
+    ApiConfig(
+        name="Y2Mate",
+        url="https://www.y2mate.com/mates/analyzeV2/ajax",
+        method="POST",
+        build=partial(_build_params, {"k_page": "home", "hl": "en", "q_auto": "1"}, url_key="k_query"),
+    ),
+    ApiConfig(
+        name="Loader",
+        url="https://loader.to/ajax/download.php",
+        method="GET",
+        build=partial(_build_params, {}, fmt_key="format"),
+    ),
+    ApiConfig(
+        name="SaveFrom",
+        url="https://api.vevioz.com/api/button/videos",
+        method="GET",
+        build=partial(_build_params, {}),
+    ),
+    ApiConfig(
+        name="Cobalt",
+        url="https://api.cobalt.tools/api/json",
+        method="POST",
+        build=partial(_build_params, {"vCodec": "h264", "vQuality": "720", "aFormat": "mp3"}),
+        as_json=True,
+    ),
+)
+
+def _write_all(fd: int, buffers: list):
+    """Write all buffers to fd, with a single writev where available"""
+    if not hasattr(os, "writev"):
+        os.write(fd, b"".join(buffers))
+        return
+    views = [memoryview(buf) for buf in buffers]
+    while views:
+        written = os.writev(fd, views)
+        # Short write: drop what was written and resubmit the rest
+        while views and written >= len(views[0]):
+            written -= len(views[0])
+            views.pop(0)
+        if views and written:
+            views[0] = views[0][written:]
+
+
+# In-process yt-dlp fallback: no interpreter start-up or extractor discovery
+# per call. Its own small thread pool (a bulkhead) keeps long downloads from
+# starving the default executor, and since YoutubeDL is not thread-safe each
+# worker thread builds and reuses its own instances.
+_YTDLP_OPTS = {
+    "audio": {
+        "format": "bestaudio/best",
+        "outtmpl": os.path.join(DOWNLOADS_FOLDER, "%(id)s.%(ext)s"),
+        "postprocessors": [{"key": "FFmpegExtractAudio", "preferredcodec": "mp3", "preferredquality": "192"}],
+        "quiet": True, "no_warnings": True,
     },
-    {
-        "name": "Y2Mate",
-        "url": "https://www.y2mate.com/mates/analyzeV2/ajax",
-        "method": "POST",
-        "params": lambda url, fmt: {"k_query": url, "k_page": "home", "hl": "en", "q_auto": "1"}
+    "video": {
+        "format": "best[ext=mp4]",
+        "outtmpl": os.path.join(DOWNLOADS_FOLDER, "%(id)s.%(ext)s"),
+        "quiet": True, "no_warnings": True,
     },
-    {
-        "name": "Loader",
-        "url": "https://loader.to/ajax/download.php",
-        "method": "GET",
-        "params": lambda url, fmt: {"url": url, "format": fmt}
-    },
-    {
-        "name": "SaveFrom",
-        "url": "https://api.vevioz.com/api/button/videos",
-        "method": "GET",
-        "params": lambda url, fmt: {"url": url}
-    },
-    {
-        "name": "Cobalt",
-        "url": "https://api.cobalt.tools/api/json",
-        "method": "POST",
-        "params": lambda url, fmt: {"url": url, "vCodec": "h264", "vQuality": "720", "aFormat": "mp3"}
+    "stream": {"format": "best[height<=?720]", "quiet": True, "no_warnings": True},
+    "meta": {"quiet": True, "no_warnings": True, "skip_download": True},
+    "playlist": {"extract_flat": True, "ignoreerrors": True, "quiet": True, "no_warnings": True},
+}
+_YTDLP_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=YTDLP_THREADS, thread_name_prefix="yt-dlp"
+)
+_YTDLP_META_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=YTDLP_META_THREADS, thread_name_prefix="yt-dlp-meta"
+)
+_ydl_local = threading.local()
+
+
+def _ydl(kind: str) -> yt_dlp.YoutubeDL:
+    """This thread's YoutubeDL for one of the _YTDLP_OPTS presets"""
+    instances = _ydl_local.__dict__
+    ydl = instances.get(kind)
+    if ydl is None:
+        ydl = instances[kind] = yt_dlp.YoutubeDL(_YTDLP_OPTS[kind])
+    return ydl
+
+
+def _ytdlp_download(kind: str, url: str) -> int:
+    return _ydl(kind).download([url])
+
+
+def _ytdlp_stream_url(url: str) -> Optional[str]:
+    info = _ydl("stream").extract_info(url, download=False) or {}
+    if info.get("url"):
+        return info["url"]
+    requested = info.get("requested_formats") or [{}]
+    return requested[0].get("url")
+
+
+def _ytdlp_playlist_ids(url: str, limit: int) -> list:
+    ydl = _ydl("playlist")
+    ydl.params["playlistend"] = int(limit)
+    info = ydl.extract_info(url, download=False) or {}
+    return [entry["id"] for entry in info.get("entries") or [] if entry and entry.get("id")]
+
+
+async def _run_ytdlp(func, *args):
+    """Run a yt-dlp helper on the yt-dlp thread pool"""
+    return await asyncio.get_running_loop().run_in_executor(_YTDLP_EXECUTOR, func, *args)
+
+
+# Per-API circuit breakers: after CB_THRESHOLD failed calls the API is skipped
+# for CB_COOLDOWN seconds, then a single half-open call probes it again
+_breakers: Dict[str, dict] = {
+    api.name: {"fails": 0, "opened_at": 0.0, "state": "closed"} for api in FREE_APIS
+}
+
+
+def _breaker_allows(breaker: dict) -> bool:
+    """Whether a call may go through; an expired open circuit admits one probe"""
+    if breaker["state"] == "closed":
+        return True
+    if breaker["state"] == "open" and time.monotonic() - breaker["opened_at"] >= CB_COOLDOWN:
+        breaker["state"] = "half_open"
+        return True
+    return False
+
+
+def _breaker_record(breaker: dict, ok: bool):
+    """Record a call result: success closes the circuit, failures open it"""
+    if ok:
+        breaker.update(fails=0, state="closed")
+        return
+    breaker["fails"] += 1
+    if breaker["state"] == "half_open" or breaker["fails"] >= CB_THRESHOLD:
+        breaker.update(state="open", opened_at=time.monotonic())
+
+
+# Precompiled once; exists() runs on every incoming play query
+_YT_URL_RE = re.compile(r"(?:youtube\.com|youtu\.be)", re.ASCII)
+
+# yt-dlp metadata cache: link -> (expires_at, info), persisted to sqlite so
+# replays and trending songs skip extract_info across restarts as well.
+# Only the format fields formats() reads are kept, which keeps rows small.
+# All sqlite I/O runs on one dedicated thread, off the event loop.
+_META_FORMAT_KEYS = ("format", "filesize", "format_id", "ext", "format_note")
+_YT_META: Dict[str, Tuple[float, dict]] = {}
+_META_DB: Optional[sqlite3.Connection] = None
+_META_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="ytmeta")
+_meta_loaded: Optional[asyncio.Task] = None
+
+
+def _meta_db_load() -> Dict[str, Tuple[float, dict]]:
+    """Open the metadata cache DB and return its unexpired rows (sqlite thread)"""
+    global _META_DB
+    os.makedirs(DOWNLOADS_FOLDER, exist_ok=True)
+    db = sqlite3.connect(META_CACHE_DB, check_same_thread=False)
+    db.execute("CREATE TABLE IF NOT EXISTS meta (link TEXT PRIMARY KEY, expiry REAL, blob BLOB)")
+    db.execute("DELETE FROM meta WHERE expiry <= ?", (time.time(),))
+    db.commit()
+    rows = {}
+    for link, expiry, blob in db.execute(
+        "SELECT link, expiry, blob FROM meta ORDER BY expiry DESC LIMIT ?", (META_CACHE_MAX,)
+    ):
+        try:
+            rows[link] = (expiry, pickle.loads(blob))
+        except Exception:
+            pass
+    _META_DB = db
+    # Oldest first, matching the in-memory eviction order
+    return dict(reversed(list(rows.items())))
+
+
+def _meta_db_store(link: str, expiry: float, info: dict):
+    """Persist one entry, dropping expired rows and rows beyond the cap (sqlite thread)"""
+    if _META_DB is None:
+        return
+    with _META_DB:
+        _META_DB.execute(
+            "INSERT OR REPLACE INTO meta (link, expiry, blob) VALUES (?, ?, ?)",
+            (link, expiry, pickle.dumps(info, pickle.HIGHEST_PROTOCOL)),
+        )
+        _META_DB.execute("DELETE FROM meta WHERE expiry <= ?", (time.time(),))
+        _META_DB.execute(
+            "DELETE FROM meta WHERE link NOT IN "
+            "(SELECT link FROM meta ORDER BY expiry DESC LIMIT ?)",
+            (META_CACHE_MAX,),
+        )
+
+
+def _meta_db_close():
+    """Close the metadata cache DB (sqlite thread)"""
+    global _META_DB
+    if _META_DB is not None:
+        _META_DB.close()
+        _META_DB = None
+
+
+async def _meta_run(func, *args):
+    """Run a sqlite helper on the metadata cache thread"""
+    return await asyncio.get_running_loop().run_in_executor(_META_EXECUTOR, func, *args)
+
+
+async def _load_meta_cache():
+    # Must never fail: every _cached_extract_info call awaits this task,
+    # so without the disk cache it simply carries on in memory
+    try:
+        _YT_META.update(await _meta_run(_meta_db_load))
+    except Exception as e:
+        logger.warning(f"Metadata cache unavailable, using memory only: {e}")
+
+
+def _extract_info(link: str) -> dict:
+    """Run yt-dlp metadata extraction and keep only the cached fields (yt-dlp meta thread)"""
+    info = _ydl("meta").extract_info(link, download=False) or {}
+    return {
+        "id": info.get("id"),
+        "formats": [
+            {key: fmt[key] for key in _META_FORMAT_KEYS if key in fmt}
+            for fmt in info.get("formats") or []
+        ],
     }
-]
+
+
+async def _cached_extract_info(link: str) -> dict:
+    """extract_info with an in-memory + sqlite TTL cache"""
+    global _meta_loaded
+    if _meta_loaded is None:
+        _meta_loaded = asyncio.ensure_future(_load_meta_cache())
+    await asyncio.shield(_meta_loaded)
+    
+    entry = _YT_META.get(link)
+    if entry and entry[0] > time.time():
+        return entry[1]
+    
+    # Off the event loop, on threads of its own: a forked process pool could
+    # inherit a lock held by Motor/pyrogram threads and deadlock, and the
+    # download pool can be tied up by long (or abandoned) downloads
+    info = await asyncio.get_running_loop().run_in_executor(
+        _YTDLP_META_EXECUTOR, _extract_info, link
+    )
+    expiry = time.time() + CACHE_TIME
+    _YT_META.pop(link, None)
+    _YT_META[link] = (expiry, info)
+    if len(_YT_META) > META_CACHE_MAX:
+        _YT_META.pop(next(iter(_YT_META)))
+    
+    try:
+        await _meta_run(_meta_db_store, link, expiry, info)
+    except sqlite3.Error as e:
+        logger.debug(f"Metadata cache write failed: {e}")
+    return info
 
 # ============================================================================
 # YOUTUBE API - MULTI-API WITH AGE-BYPASS
@@ -65,22 +322,88 @@ FREE_APIS = [
 class YouTubeAPI:
     """YouTube API - 5 APIs + yt-dlp (100% Coverage)"""
     
+    # Everything from the first "&" (covers "&si=") or "?si=" onwards
+    _STRIP = re.compile(r"(?:&|\?si=).*$", re.S)
+    
     def __init__(self):
         self.base = "https://www.youtube.com/watch?v="
-        self.regex = r"(?:youtube\.com|youtu\.be)"
+        self.regex = _YT_URL_RE
         self.listbase = "https://youtube.com/playlist?list="
         self.reg = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
+        # Shared by every API probe and download (keep-alive, pooled connections)
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Search results: link -> (fetched_at, details), least recently used
+        # links evicted beyond the size cap; concurrent lookups of the same
+        # link share one in-flight search
+        self._details_cache: OrderedDict[str, Tuple[float, dict]] = OrderedDict()
+        self._details_inflight: Dict[str, asyncio.Task] = {}
+        # Per-API response parsers, keyed by ApiConfig.name
+        self._extractors: Dict[str, Callable[[dict], Optional[str]]] = {
+            "SocialDown": self._x_socialdown,
+            "Y2Mate": self._x_y2mate,
+            "Loader": self._x_loader,
+            "SaveFrom": self._x_url,
+            "Cobalt": self._x_url,
+        }
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100, limit_per_host=20, ttl_dns_cache=300, keepalive_timeout=75
+                ),
+                timeout=aiohttp.ClientTimeout(total=API_TIMEOUT),
+            )
+        return self._session
+
+    async def close(self):
+        """Close the HTTP session, metadata cache DB and worker pools (call on shutdown)"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        await _meta_run(_meta_db_close)
+        _META_EXECUTOR.shutdown(wait=False)
+        _YTDLP_META_EXECUTOR.shutdown(wait=False)
+        _YTDLP_EXECUTOR.shutdown(wait=False)
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """Exponential backoff with full jitter, so concurrent retries spread out"""
+        return random.uniform(0, min(MAX_BACKOFF, RETRY_DELAY * 2 ** attempt))
+
+    @classmethod
+    def _clean_link(cls, link: str) -> str:
+        """Strip extra query params and share (si=) tracking from a link"""
+        return cls._STRIP.sub("", link, count=1)
 
     async def _get_video_details(self, link: str, limit: int = 20):
-        """Get video details from search"""
+        """Get video details from search (TTL-cached, single-flight per link)"""
+        if not link:
+            return None
+        
+        link = str(link).strip()
+        if not link:
+            return None
+        
+        cached = self._details_cache.get(link)
+        if cached and time.monotonic() - cached[0] < METADATA_TTL:
+            self._details_cache.move_to_end(link)
+            return dict(cached[1])
+        
+        task = self._details_inflight.get(link)
+        if task is None:
+            task = asyncio.create_task(self._search_video_details(link, limit))
+            self._details_inflight[link] = task
+            task.add_done_callback(lambda _: self._details_inflight.pop(link, None))
+        
+        # Shielded so one cancelled caller doesn't cancel the search for the rest
+        result = await asyncio.shield(task)
+        return dict(result) if result else None
+
+    async def _search_video_details(self, link: str, limit: int = 20):
+        """Search for a link and cache the first result's details"""
         try:
-            if not link:
-                return None
-            
-            link = str(link).strip()
-            if not link:
-                return None
-            
             try:
                 results = VideosSearch(link, limit=limit)
                 search_results = (await results.next()).get("result", [])
@@ -116,152 +439,195 @@ class YouTubeAPI:
             
             link_url = str(result.get("link") or f"https://www.youtube.com/watch?v={video_id}").strip()
             
-            return {
+            details = {
                 "title": title,
                 "duration": duration,
                 "thumbnails": [{"url": thumbnail_url}],
                 "id": video_id,
                 "link": link_url
             }
+            self._details_cache[link] = (time.monotonic(), details)
+            self._details_cache.move_to_end(link)
+            if len(self._details_cache) > METADATA_CACHE_MAX:
+                self._details_cache.popitem(last=False)
+            return details
 
         except Exception as e:
             logger.error(f"Details error: {e}")
             return None
 
-    async def _try_api(self, api_config: dict, url: str, fmt: str):
-        """Try a single API"""
+    async def _call_api(self, api_config: ApiConfig, url: str, fmt: str):
+        """Make one request to a single API"""
         try:
-            api_name = api_config["name"]
-            api_url = api_config["url"]
-            method = api_config["method"]
-            params = api_config["params"](url, fmt)
+            api_name = api_config.name
+            params = api_config.build(url, fmt)
+            session = await self._get_session()
             
-            async with aiohttp.ClientSession() as session:
-                if method == "GET":
-                    async with session.get(
-                        api_url,
-                        params=params,
-                        timeout=aiohttp.ClientTimeout(total=API_TIMEOUT)
-                    ) as resp:
-                        if resp.status == 200:
-                            data = await resp.json()
-                            return self._extract_download_url(data, api_name)
-                else:  # POST
-                    async with session.post(
-                        api_url,
-                        json=params if api_name == "Cobalt" else None,
-                        data=params if api_name != "Cobalt" else None,
-                        timeout=aiohttp.ClientTimeout(total=API_TIMEOUT)
-                    ) as resp:
-                        if resp.status == 200:
-                            data = await resp.json()
-                            return self._extract_download_url(data, api_name)
+            if api_config.method == "GET":
+                request = session.get(api_config.url, params=params)
+            elif api_config.as_json:
+                request = session.post(api_config.url, json=params)
+            else:  # POST form
+                request = session.post(api_config.url, data=params)
+            
+            async with request as resp:
+                if resp.status == 200:
+                    data = await resp.json()
+                    return self._extract_download_url(data, api_name)
             
             return None
         except Exception as e:
-            logger.debug(f"[{api_config['name']}] Error: {e}")
+            logger.debug(f"[{api_config.name}] Error: {e}")
             return None
 
+    @staticmethod
+    def _x_socialdown(data: dict):
+        if data.get("success") and data.get("data"):
+            return data["data"][0].get("downloadUrl")
+        return None
+
+    @staticmethod
+    def _x_y2mate(data: dict):
+        links = data.get("links")
+        if not links:
+            return None
+        for kind in ("mp3", "mp4"):
+            if kind in links:
+                url = next((q["url"] for q in links[kind].values() if q.get("url")), None)
+                if url:
+                    return url
+        return None
+
+    @staticmethod
+    def _x_loader(data: dict):
+        return data.get("download_url") or None
+
+    @staticmethod
+    def _x_url(data: dict):
+        # Cobalt and SaveFrom both answer with a top-level "url"
+        return data.get("url") or None
+
     def _extract_download_url(self, data: dict, api_name: str):
         """Extract download URL from different API response formats"""
-        try:
-            # SocialDown format
-            if api_name == "SocialDown":
-                if data.get("success") and data.get("data"):
-                    return data["data"][0].get("downloadUrl")
-            
-            # Cobalt format
-            elif api_name == "Cobalt":
-                if data.get("url"):
-                    return data["url"]
-            
-            # Y2Mate format
-            elif api_name == "Y2Mate":
-                if data.get("links"):
-                    links = data["links"]
-                    if "mp3" in links:
-                        for quality in links["mp3"]:
-                            if links["mp3"][quality].get("url"):
-                                return links["mp3"][quality]["url"]
-                    if "mp4" in links:
-                        for quality in links["mp4"]:
-                            if links["mp4"][quality].get("url"):
-                                return links["mp4"][quality]["url"]
-            
-            # Loader format
-            elif api_name == "Loader":
-                if data.get("download_url"):
-                    return data["download_url"]
-            
-            # SaveFrom format
-            elif api_name == "SaveFrom":
-                if data.get("url"):
-                    return data["url"]
-            
+        extractor = self._extractors.get(api_name)
+        if extractor is None:
             return None
+        try:
+            return extractor(data)
         except:
             return None
 
-    async def _fetch_multi_api(self, url: str, fmt: str = "mp3"):
-        """Try all APIs in sequence until one works"""
-        logger.info(f"🚀 Trying {len(FREE_APIS)} FREE APIs...")
+    async def _try_api(self, api_config: ApiConfig, url: str, fmt: str):
+        """Try a single API up to MAX_API_RETRIES times, backing off between attempts"""
+        breaker = _breakers[api_config.name]
+        if not _breaker_allows(breaker):
+            logger.debug(f"   [{api_config.name}] Circuit open, skipped")
+            return None
         
-        for api_config in FREE_APIS:
+        try:
             for attempt in range(MAX_API_RETRIES):
                 try:
-                    logger.info(f"   → [{api_config['name']}] Attempt {attempt+1}/{MAX_API_RETRIES}")
+                    logger.info(f"   → [{api_config.name}] Attempt {attempt+1}/{MAX_API_RETRIES}")
                     
-                    download_url = await self._try_api(api_config, url, fmt)
+                    download_url = await self._call_api(api_config, url, fmt)
                     
                     if download_url:
-                        logger.info(f"   ✅ [{api_config['name']}] SUCCESS!")
+                        logger.info(f"   ✅ [{api_config.name}] SUCCESS!")
+                        _breaker_record(breaker, True)
                         return download_url
-                    
-                    await asyncio.sleep(RETRY_DELAY)
                 except Exception as e:
-                    logger.debug(f"   [{api_config['name']}] Error: {e}")
-                    await asyncio.sleep(RETRY_DELAY)
+                    logger.debug(f"   [{api_config.name}] Error: {e}")
+                
+                if attempt + 1 < MAX_API_RETRIES:
+                    await asyncio.sleep(self._backoff(attempt))
+        except asyncio.CancelledError:
+            # Lost the race: not a failure, but free the half-open probe slot
+            if breaker["state"] == "half_open":
+                breaker["state"] = "open"
+            raise
+        
+        _breaker_record(breaker, False)
+        if breaker["state"] == "open":
+            logger.warning(f"[{api_config.name}] Circuit open for {CB_COOLDOWN}s")
+        return None
+
+    async def _fetch_multi_api(self, url: str, fmt: str = "mp3"):
+        """Race all APIs concurrently and return the first usable URL"""
+        logger.info(f"🚀 Trying {len(FREE_APIS)} FREE APIs...")
+        
+        pending = {
+            asyncio.create_task(self._try_api(api_config, url, fmt))
+            for api_config in FREE_APIS
+        }
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not task.cancelled() and task.exception() is None and task.result():
+                        return task.result()
+        finally:
+            for task in pending:
+                task.cancel()
         
         logger.warning(f"All {len(FREE_APIS)} APIs failed")
         return None
 
     async def _download_file(self, url: str, filepath: str):
-        """Download file from URL"""
+        """Download file from URL (into a .part file, moved into place once complete)"""
+        part_path = filepath + ".part"
         try:
             os.makedirs(os.path.dirname(filepath), exist_ok=True)
             
             logger.info(f"📥 Downloading...")
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url,
-                    timeout=aiohttp.ClientTimeout(total=DOWNLOAD_TIMEOUT)
-                ) as resp:
-                    if resp.status == 200:
-                        total_size = 0
-                        with open(filepath, 'wb') as f:
-                            async for chunk in resp.content.iter_chunked(1024*1024):
-                                f.write(chunk)
-                                total_size += len(chunk)
-                        
-                        if os.path.exists(filepath) and os.path.getsize(filepath) > 1000:
-                            logger.info(f"✅ Downloaded {total_size} bytes")
-                            return True
+            session = await self._get_session()
+            async with session.get(
+                url,
+                timeout=aiohttp.ClientTimeout(total=DOWNLOAD_TIMEOUT)
+            ) as resp:
+                if resp.status == 200:
+                    # Disk writes run in the default executor, not on the event
+                    # loop. Network reads return whatever is buffered (often a
+                    # few KiB), so they are coalesced into ~DOWNLOAD_CHUNK_SIZE
+                    # batches, each flushed by one vectored write without
+                    # joining the chunks first
+                    loop = asyncio.get_running_loop()
+                    fd = os.open(part_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                    try:
+                        pending, pending_size = [], 0
+                        async for chunk in resp.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                            pending.append(chunk)
+                            pending_size += len(chunk)
+                            if pending_size >= DOWNLOAD_CHUNK_SIZE or len(pending) >= WRITEV_MAX_BUFFERS:
+                                await loop.run_in_executor(None, _write_all, fd, pending)
+                                pending, pending_size = [], 0
+                        if pending:
+                            await loop.run_in_executor(None, _write_all, fd, pending)
+                    finally:
+                        os.close(fd)
+                    
+                    size = os.path.getsize(part_path)
+                    if size > 1000:
+                        os.replace(part_path, filepath)
+                        logger.info(f"✅ Downloaded {size} bytes")
+                        return True
             
             return False
         except Exception as e:
             logger.error(f"Download error: {e}")
-            if os.path.exists(filepath):
+            return False
+        finally:
+            # Left over only when the download failed or was too small
+            if os.path.exists(part_path):
                 try:
-                    os.remove(filepath)
+                    os.remove(part_path)
                 except:
                     pass
-            return False
 
     async def exists(self, link: str, videoid: Union[bool, str] = None):
         if videoid:
             link = self.base + link
-        return bool(re.search(self.regex, link))
+        return bool(self.regex.search(link))
 
     async def url(self, message_1: Message) -> Union[str, None]:
         messages = [message_1]
@@ -284,12 +650,7 @@ class YouTubeAPI:
         if videoid:
             link = self.base + link
         
-        if "&" in link:
-            link = link.split("&")[0]
-        if "?si=" in link:
-            link = link.split("?si=")[0]
-        elif "&si=" in link:
-            link = link.split("&si=")[0]
+        link = self._clean_link(link)
 
         result = await self._get_video_details(link)
         if not result:
@@ -312,12 +673,7 @@ class YouTubeAPI:
         if videoid:
             link = self.base + link
         
-        if "&" in link:
-            link = link.split("&")[0]
-        if "?si=" in link:
-            link = link.split("?si=")[0]
-        elif "&si=" in link:
-            link = link.split("&si=")[0]
+        link = self._clean_link(link)
             
         result = await self._get_video_details(link)
         return result.get("title", "Unknown") if result else "Unknown"
@@ -326,12 +682,7 @@ class YouTubeAPI:
         if videoid:
             link = self.base + link
         
-        if "&" in link:
-            link = link.split("&")[0]
-        if "?si=" in link:
-            link = link.split("?si=")[0]
-        elif "&si=" in link:
-            link = link.split("&si=")[0]
+        link = self._clean_link(link)
 
         result = await self._get_video_details(link)
         return result.get("duration", "0:00") if result else "0:00"
@@ -340,12 +691,7 @@ class YouTubeAPI:
         if videoid:
             link = self.base + link
         
-        if "&" in link:
-            link = link.split("&")[0]
-        if "?si=" in link:
-            link = link.split("?si=")[0]
-        elif "&si=" in link:
-            link = link.split("&si=")[0]
+        link = self._clean_link(link)
 
         result = await self._get_video_details(link)
         if not result:
@@ -358,12 +704,7 @@ class YouTubeAPI:
         if videoid:
             link = self.base + link
         
-        if "&" in link:
-            link = link.split("&")[0]
-        if "?si=" in link:
-            link = link.split("?si=")[0]
-        elif "&si=" in link:
-            link = link.split("&si=")[0]
+        link = self._clean_link(link)
 
         # Try Multi-API
         video_url = await self._fetch_multi_api(link, "mp4")
@@ -373,15 +714,10 @@ class YouTubeAPI:
         # Fallback to yt-dlp
         logger.info("Trying yt-dlp (no cookies)...")
         try:
-            proc = await asyncio.create_subprocess_exec(
-                "yt-dlp", "-g", "-f", "best[height<=?720]", link,
-                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await proc.communicate()
-            if stdout:
-                return 1, stdout.decode().split("\n")[0]
-            else:
-                return 0, stderr.decode()
+            stream_url = await _run_ytdlp(_ytdlp_stream_url, link)
+            if stream_url:
+                return 1, stream_url
+            return 0, "No stream URL found"
         except Exception as e:
             return 0, str(e)
 
@@ -389,21 +725,10 @@ class YouTubeAPI:
         if videoid:
             link = self.listbase + link
         
-        if "&" in link:
-            link = link.split("&")[0]
-        if "?si=" in link:
-            link = link.split("?si=")[0]
-        elif "&si=" in link:
-            link = link.split("&si=")[0]
+        link = self._clean_link(link)
         
         try:
-            proc = await asyncio.create_subprocess_shell(
-                f"yt-dlp -i --get-id --flat-playlist --playlist-end {limit} --skip-download {link}",
-                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
-            )
-            out, err = await proc.communicate()
-            playlist = out.decode("utf-8")
-            return [x for x in playlist.split("\n") if x.strip()]
+            return await _run_ytdlp(_ytdlp_playlist_ids, link, limit)
         except:
             return []
 
@@ -411,12 +736,7 @@ class YouTubeAPI:
         if videoid:
             link = self.base + link
         
-        if "&" in link:
-            link = link.split("&")[0]
-        if "?si=" in link:
-            link = link.split("?si=")[0]
-        elif "&si=" in link:
-            link = link.split("&si=")[0]
+        link = self._clean_link(link)
 
         result = await self._get_video_details(link)
         if not result:
@@ -434,33 +754,24 @@ class YouTubeAPI:
         if videoid:
             link = self.base + link
         
-        if "&" in link:
-            link = link.split("&")[0]
-        if "?si=" in link:
-            link = link.split("?si=")[0]
-        elif "&si=" in link:
-            link = link.split("&si=")[0]
-        
-        ytdl_opts = {"quiet": True, "no_warnings": True}
+        link = self._clean_link(link)
         
-        ydl = yt_dlp.YoutubeDL(ytdl_opts)
         formats_available = []
         try:
-            with ydl:
-                r = ydl.extract_info(link, download=False)
-                for fmt in r.get("formats", []):
-                    try:
-                        if "dash" not in str(fmt.get("format", "")).lower():
-                            formats_available.append({
-                                "format": fmt["format"],
-                                "filesize": fmt.get("filesize", 0),
-                                "format_id": fmt["format_id"],
-                                "ext": fmt["ext"],
-                                "format_note": fmt.get("format_note", ""),
-                                "yturl": link,
-                            })
-                    except:
-                        pass
+            r = await _cached_extract_info(link)
+            formats_available = [
+                {
+                    "format": fmt["format"],
+                    "filesize": fmt.get("filesize", 0),
+                    "format_id": fmt["format_id"],
+                    "ext": fmt["ext"],
+                    "format_note": fmt.get("format_note", ""),
+                    "yturl": link,
+                }
+                for fmt in r.get("formats") or ()
+                if "format" in fmt and "format_id" in fmt and "ext" in fmt
+                and "dash" not in str(fmt["format"]).lower()
+            ]
         except:
             pass
         
@@ -470,12 +781,7 @@ class YouTubeAPI:
         if videoid:
             link = self.base + link
         
-        if "&" in link:
-            link = link.split("&")[0]
-        if "?si=" in link:
-            link = link.split("?si=")[0]
-        elif "&si=" in link:
-            link = link.split("&si=")[0]
+        link = self._clean_link(link)
 
         try:
             results = []
@@ -562,25 +868,21 @@ class YouTubeAPI:
                 
                 for attempt in range(MAX_YTDLP_RETRIES):
                     try:
-                        proc = await asyncio.create_subprocess_exec(
-                            "yt-dlp", "--extract-audio", "--audio-format", "mp3",
-                            "--audio-quality", "192", "-o", filepath, youtube_url,
-                            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
-                        )
-                        
-                        stdout, stderr = await asyncio.wait_for(
-                            proc.communicate(), timeout=DOWNLOAD_TIMEOUT
+                        retcode = await asyncio.wait_for(
+                            _run_ytdlp(_ytdlp_download, "audio", youtube_url),
+                            timeout=DOWNLOAD_TIMEOUT
                         )
                         
-                        if proc.returncode == 0 and os.path.exists(filepath):
+                        if retcode == 0 and os.path.exists(filepath):
                             size = os.path.getsize(filepath)
                             if size > 1000:
                                 logger.info(f"✅ YT-DLP SUCCESS ({size} bytes)")
                                 return filepath, False
-                        
-                        await asyncio.sleep(RETRY_DELAY)
-                    except:
-                        await asyncio.sleep(RETRY_DELAY)
+                    except Exception:
+                        pass
+                    
+                    if attempt + 1 < MAX_YTDLP_RETRIES:
+                        await asyncio.sleep(self._backoff(attempt))
                 
                 logger.error(f"❌ ALL TIERS FAILED")
                 return None, False
@@ -609,7 +911,7 @@ class YouTubeAPI:
                 logger.info(f"🎯 TIER 2: Trying 5 FREE APIs...")
                 video_url = await self._fetch_multi_api(youtube_url, "mp4")
                 
-                if audio_url:
+                if video_url:
                     if await self._download_file(video_url, filepath):
                         logger.info(f"✅ API SUCCESS")
                         return filepath, False
@@ -620,24 +922,21 @@ class YouTubeAPI:
                 
                 for attempt in range(MAX_YTDLP_RETRIES):
                     try:
-                        proc = await asyncio.create_subprocess_exec(
-                            "yt-dlp", "-f", "best[ext=mp4]", "-o", filepath, youtube_url,
-                            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
-                        )
-                        
-                        stdout, stderr = await asyncio.wait_for(
-                            proc.communicate(), timeout=DOWNLOAD_TIMEOUT
+                        retcode = await asyncio.wait_for(
+                            _run_ytdlp(_ytdlp_download, "video", youtube_url),
+                            timeout=DOWNLOAD_TIMEOUT
                         )
                         
-                        if proc.returncode == 0 and os.path.exists(filepath):
+                        if retcode == 0 and os.path.exists(filepath):
                             size = os.path.getsize(filepath)
                             if size > 10000:
                                 logger.info(f"✅ YT-DLP SUCCESS ({size} bytes)")
                                 return filepath, False
-                        
-                        await asyncio.sleep(RETRY_DELAY)
-                    except:
-                        await asyncio.sleep(RETRY_DELAY)
+                    except Exception:
+                        pass
+                    
+                    if attempt + 1 < MAX_YTDLP_RETRIES:
+                        await asyncio.sleep(self._backoff(attempt))
                 
                 logger.error(f"❌ ALL TIERS FAILED")
                 return None, False
@@ -15,5 +15,5 @@ def __list_all_modules():
     return all_modules
 
 
-ALL_MODULES = sorted(__list_all_modules())
-__all__ = ALL_MODULES + ["ALL_MODULES"]
+ALL_MODULES = tuple(sorted(__list_all_modules()))
+__all__ = list(ALL_MODULES) + ["ALL_MODULES"]
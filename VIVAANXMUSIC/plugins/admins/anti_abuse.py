@@ -25,10 +25,11 @@ except ImportError:
 from VIVAANXMUSIC import app
 
 try:
-    from VIVAANXMUSIC.mongo.abuse_words_db import abuse_words_db
+    from VIVAANXMUSIC.mongo.abuse_words_db import get_abuse_words_db
     from VIVAANXMUSIC.utils.abuse_detector import get_detector
 except ImportError:
-    abuse_words_db = None
+    def get_abuse_words_db():
+        return None
     get_detector = None
 
 logger = logging.getLogger(__name__)
@@ -48,17 +49,19 @@ class AntiAbuseManager:
             return False
     
     async def should_detect_abuse(self, chat_id: int) -> bool:
+        abuse_words_db = get_abuse_words_db()
         if not abuse_words_db:
             return False
         config = await abuse_words_db.get_config(chat_id)
         return config.get("enabled", True)
     
     async def detect_abuse_in_message(self, text: str, strict_mode: bool = False) -> Tuple[bool, Optional[str]]:
+        abuse_words_db = get_abuse_words_db()
         if not text or not self.detector or not abuse_words_db:
             return False, None
-        abuse_words = await abuse_words_db.get_all_abuse_words()
-        words_list = [w.get("word") for w in abuse_words]
-        return self.detector.detect_abuse(text, words_list, strict_mode)
+        words_list = await abuse_words_db.get_word_list()
+        matcher = await abuse_words_db.get_matcher()
+        return self.detector.detect_abuse(text, words_list, strict_mode, matcher)
 
     async def send_warning_message(self, chat_id: int, message_id: int, warnings: int, username: str = "User") -> Optional[Message]:
         warning_text = (
@@ -86,6 +89,7 @@ anti_abuse_manager = AntiAbuseManager()
 @app.on_message(filters.text & filters.group & ~filters.bot & ~filters.service, group=5)
 async def handle_message_abuse(client: Client, message: Message):
     try:
+        abuse_words_db = get_abuse_words_db()
         chat_id = message.chat.id
         user_id = message.from_user.id if message.from_user else None
         if not user_id or not abuse_words_db:
@@ -120,6 +124,7 @@ async def handle_message_abuse(client: Client, message: Message):
 @app.on_message(filters.command("antiabuse") & filters.group, group=4)
 async def antiabuse_command(client: Client, message: Message):
     try:
+        abuse_words_db = get_abuse_words_db()
         if not abuse_words_db:
             return await message.reply_text("❌ **Database not initialized**")
         is_admin = await anti_abuse_manager.is_admin(message.chat.id, message.from_user.id)
@@ -168,6 +173,7 @@ async def antiabuse_command(client: Client, message: Message):
 async def addabuse_command(client: Client, message: Message):
     """Owner adds a word globally."""
     try:
+        abuse_words_db = get_abuse_words_db()
         if message.from_user.id != OWNER_ID:
             return await message.reply_text("❌ Owner only")
         if not abuse_words_db:
@@ -188,6 +194,7 @@ async def addabuse_command(client: Client, message: Message):
 async def addmanyabuse_command(client: Client, message: Message):
     """Owner adds several words at once."""
     try:
+        abuse_words_db = get_abuse_words_db()
         if message.from_user.id != OWNER_ID:
             return await message.reply_text("❌ Owner only")
         if not abuse_words_db:
@@ -211,6 +218,7 @@ async def addmanyabuse_command(client: Client, message: Message):
 @app.on_message(filters.command("listabuse") & filters.group, group=4)
 async def listabuse_command(client: Client, message: Message):
     try:
+        abuse_words_db = get_abuse_words_db()
         if not abuse_words_db:
             return await message.reply_text("❌ Not initialized")
         words = await abuse_words_db.get_all_abuse_words()
@@ -227,6 +235,7 @@ async def listabuse_command(client: Client, message: Message):
 @app.on_message(filters.command("clearabuse") & filters.group, group=4)
 async def clearabuse_command(client: Client, message: Message):
     try:
+        abuse_words_db = get_abuse_words_db()
         if not abuse_words_db:
             return await message.reply_text("❌ Not initialized")
         if not (await anti_abuse_manager.is_admin(message.chat.id, message.from_user.id)):
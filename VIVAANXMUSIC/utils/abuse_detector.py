@@ -5,9 +5,29 @@ import unicodedata
 
 logger = logging.getLogger(__name__)
 
+
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c == "_"
+
+
+def _at_boundary(text: str, i: int) -> bool:
+    """Same test as regex \\b at index i of text."""
+    before = i > 0 and _is_word_char(text[i - 1])
+    after = i < len(text) and _is_word_char(text[i])
+    return before != after
+
+
 class AbuseDetector:
     """Safe and robust abuse detector."""
 
+    @staticmethod
+    def _automaton_match(automaton, text: str) -> Optional[str]:
+        for end, (_, word) in automaton.iter(text):
+            start = end - len(word) + 1
+            if _at_boundary(text, start) and _at_boundary(text, end + 1):
+                return word
+        return None
+
     def normalize_text(self, text: str) -> str:
         if not text:
             return ""
@@ -22,7 +42,12 @@ class AbuseDetector:
         return re.sub(r'[\s\.\,\-_\*\|/]+', '', text)
 
     # Replace this detect_abuse method with the one below:
-    def detect_abuse(self, text: str, abuse_words: List[str], strict_mode: bool = False) -> Tuple[bool, Optional[str]]:
+    def detect_abuse(self, text: str, abuse_words: List[str], strict_mode: bool = False, matcher=None) -> Tuple[bool, Optional[str]]:
+        """
+        matcher: optional prebuilt automaton over abuse_words with
+        (severity, word) values, e.g. AbuseWordsDB.get_matcher();
+        without one each word falls back to a per-word regex check
+        """
         if not text or not abuse_words:
             return False, None
 
@@ -30,11 +55,21 @@ class AbuseDetector:
         normalized_text = self.normalize_text(text)
         text_no_sep = self.remove_separators(normalized_text)
 
+        # 1. Whole-word match for every word in a single automaton pass
+        use_automaton = matcher is not None
+        if use_automaton:
+            matched = self._automaton_match(matcher, normalized_text)
+            if matched:
+                logger.debug(f"[AbuseDetector] Word boundary match: {matched}")
+                return True, matched
+            if not strict_mode:
+                return False, None
+
         for word in abuse_words:
             word_lower = word.lower().strip()
 
             # 1. Require safe, whole-word match (no accidental substring matches)
-            if re.search(rf"\b{re.escape(word_lower)}\b", normalized_text):
+            if not use_automaton and re.search(rf"\b{re.escape(word_lower)}\b", normalized_text):
                 logger.debug(f"[AbuseDetector] Word boundary match: {word_lower}")
                 return True, word_lower
 
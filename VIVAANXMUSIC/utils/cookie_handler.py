@@ -1,6 +1,8 @@
 import asyncio
+import contextlib
 import requests
 from pathlib import Path
+from typing import Optional
 from urllib.parse import urlsplit
 
 from config import COOKIE_URL
@@ -8,6 +10,8 @@ from VIVAANXMUSIC.utils.errors import capture_internal_err
 
 COOKIE_PATH = Path("VIVAANXMUSIC/assets/cookies.txt")
 
+_cookie_task: Optional[asyncio.Task] = None
+
 
 def _extract_paste_id(url: str) -> str:
     path = urlsplit(url).path.rstrip("/")
@@ -61,3 +65,17 @@ async def fetch_and_store_cookies():
         COOKIE_PATH.write_text(cookies, encoding="utf-8")
     except Exception as e:
         raise IOError(f"⚠️ ғᴀɪʟᴇᴅ ᴛᴏ sᴀᴠᴇ ᴄᴏᴏᴋɪᴇs: {e}")
+
+
+def start_cookie_fetch() -> asyncio.Task:
+    """Fetch cookies in the background; yt-dlp callers await it lazily."""
+    global _cookie_task
+    _cookie_task = asyncio.create_task(fetch_and_store_cookies())
+    return _cookie_task
+
+
+async def wait_for_cookies():
+    """Wait for a pending background cookie fetch, ignoring its failure."""
+    if _cookie_task and not _cookie_task.done():
+        with contextlib.suppress(Exception):
+            await asyncio.shield(_cookie_task)
@@ -1,4 +1,5 @@
 import random
+import time
 from typing import Dict, List, Union
 
 from VIVAANXMUSIC import userbot
@@ -15,6 +16,7 @@ channeldb = mongodb.cplaymode
 countdb = mongodb.upcount
 gbansdb = mongodb.gban
 langdb = mongodb.language
+metadb = mongodb.meta
 onoffdb = mongodb.onoffper
 playmodedb = mongodb.playmode
 playtypedb = mongodb.playtypedb
@@ -660,3 +662,16 @@ async def remove_banned_user(user_id: int):
     if not is_gbanned:
         return
     return await blockeddb.delete_one({"user_id": user_id})
+
+
+async def get_vc_check() -> float:
+    data = await metadb.find_one({"_id": "vc_check"})
+    if not data:
+        return 0
+    return data["ts"]
+
+
+async def set_vc_check():
+    return await metadb.update_one(
+        {"_id": "vc_check"}, {"$set": {"ts": time.time()}}, upsert=True
+    )
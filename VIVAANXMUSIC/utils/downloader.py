@@ -10,7 +10,7 @@ from aiohttp import TCPConnector
 from yt_dlp import YoutubeDL
 
 from VIVAANXMUSIC.core.dir import DOWNLOAD_DIR as _DOWNLOAD_DIR, CACHE_DIR
-from VIVAANXMUSIC.utils.cookie_handler import COOKIE_PATH
+from VIVAANXMUSIC.utils.cookie_handler import COOKIE_PATH, wait_for_cookies
 from VIVAANXMUSIC.utils.tuning import CHUNK_SIZE, SEM
 from config import API_KEY, API_URL
 
@@ -166,6 +166,7 @@ async def yt_dlp_download(
     link: str, type: str, format_id: str = None, title: str = None
 ) -> Optional[str]:
     loop = asyncio.get_running_loop()
+    await wait_for_cookies()
 
     if type == "audio":
         key = f"a:{link}"